@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import os
+import glob
+import json
+import argparse
+from typing import Any, Dict, Iterable, Iterator, List, Set, Union
+
+from robot.api.deco import keyword  # ✅ Expose to Robot Framework
+
+import baugesuch_manifest
+import baugesuch_municipalities
+import baugesuch_reader
+from baugesuch_debug import DEBUG_DIR, LEVELS, WRITER
+
+ROBOT_AUTO_KEYWORDS = False  # only @keyword functions are Robot keywords
+
+
+# ============================== Input discovery ==============================
+
+def iter_issue_pdfs(inputs: Union[str, Iterable[str]]) -> Iterator[str]:
+    """
+    Expand directories (their *.pdf), glob patterns and plain paths into issue PDFs,
+    sorted per input and de-duplicated. Lazy per input, so back-fills start streaming at once.
+    """
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    seen: Set[str] = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths = sorted(glob.glob(os.path.join(item, "*.pdf")))
+        elif glob.has_magic(item):
+            paths = sorted(glob.glob(item))
+        else:
+            paths = [item]
+        for p in paths:
+            ap = os.path.abspath(p)
+            if ap not in seen and ap.lower().endswith(".pdf"):
+                seen.add(ap)
+                yield p
+
+def _issue_name(pdf_path: str) -> str:
+    return os.path.splitext(os.path.basename(pdf_path))[0]
+
+def _purge_sink(output_jsonl_path: str, pdf_path: str) -> None:
+    """Drop the records of one issue from the sink (streamed copy, constant memory)."""
+    if not os.path.isfile(output_jsonl_path):
+        return
+    target = os.path.abspath(pdf_path)
+    tmp = output_jsonl_path + ".tmp"
+    with open(output_jsonl_path, "r", encoding="utf-8") as src, open(tmp, "w", encoding="utf-8") as dst:
+        for line in src:
+            try:
+                if os.path.abspath(json.loads(line)["pdf"]) == target:
+                    continue
+            except (ValueError, KeyError, TypeError):
+                pass
+            dst.write(line)
+    os.replace(tmp, output_jsonl_path)
+
+
+# ================================ Public API =================================
+
+@keyword("Parse Baugesuch Batch")
+def parse_baugesuch_batch(inputs: Union[str, List[str]], output_jsonl_path: str, scan_all: bool = True,
+                          ocr_workers: int = 0, resume: bool = True, manifest_path: str = "",
+                          debug: str = "", gemeinden: str = "") -> int:
+    """
+    Robot Keyword: parse every issue PDF matched by `inputs` (directory, glob or paths) and
+    stream one JSONL record per Baugesuch box to `output_jsonl_path` as soon as it is parsed.
+    Each record is {"issue", "pdf", "page", "box", <entry fields>, "Gemeinde"}; `gemeinden`
+    ("Würenlos,Killwangen", "all"; default BAUGESUCH_GEMEINDEN) picks the Gemeinden, all
+    extracted in the same pass over each issue.
+
+    Progress is kept in a SQLite manifest (default: <output>.manifest.sqlite) holding each
+    PDF's hash, scanned pages, text/OCR method per page and output. With resume=True,
+    unchanged issues finished with the same Gemeinden and scan_all are skipped; new, modified
+    or interrupted ones, ones done with another selection, or ones where OCR failed on a page
+    (status "failed"), have their old records dropped from the sink and are redone. resume=False starts a fresh sink.
+    Debug artefacts go to <output dir>/debug/<issue>/ per `debug` level (off | failure | always).
+    Returns the records written.
+    Example:
+        ${n}=    Parse Baugesuch Batch    ${CURDIR}${/}input    ${CURDIR}${/}output${/}baugesuch.jsonl
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_jsonl_path)), exist_ok=True)
+    manifest_path = manifest_path or os.path.splitext(output_jsonl_path)[0] + ".manifest.sqlite"
+    debug_dir = DEBUG_DIR or os.path.join(os.path.dirname(os.path.abspath(output_jsonl_path)), "debug")
+    if not resume:
+        open(output_jsonl_path, "w", encoding="utf-8").close()
+
+    # a finished issue counts as current only for the same Gemeinden and scan mode
+    wanted = baugesuch_manifest.selection([m.key for m in baugesuch_municipalities.get_registry().select(gemeinden)],
+                                          scan_all)
+    written = 0
+    with baugesuch_manifest.Manifest(manifest_path) as manifest:
+        for pdf_path in iter_issue_pdfs(inputs):
+            if resume and manifest.is_current(pdf_path, output_jsonl_path, wanted):
+                continue
+            if manifest.lookup(pdf_path):
+                _purge_sink(output_jsonl_path, pdf_path)
+            manifest.start(pdf_path, output_jsonl_path, wanted)
+
+            issue = _issue_name(pdf_path)
+            info: Dict[str, Any] = {}
+            records = 0
+            with open(output_jsonl_path, "a", encoding="utf-8") as sink:
+                for page1, box, entry in baugesuch_reader.iter_baugesuch_entries(
+                        pdf_path, scan_all=scan_all, ocr_workers=ocr_workers, scan_info=info,
+                        debug_dir=debug_dir, debug=debug, gemeinden=gemeinden):
+                    record = {"issue": issue, "pdf": os.path.abspath(pdf_path), "page": page1, "box": box, **entry}
+                    sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    sink.flush()
+                    records += 1
+
+            status = manifest.finish(pdf_path, output_jsonl_path, info.get("pages", []), info.get("methods", {}),
+                                     records, wanted)
+            if status == baugesuch_manifest.STATUS_FAILED:
+                failed = sorted(p for p, m in info.get("methods", {}).items() if m == "ocr_failed")
+                baugesuch_reader.LOG.warning("%s: OCR failed on pages %s; the issue is redone on the next run",
+                                             issue, failed)
+            written += records
+    WRITER.flush()
+    return written
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Stream Baugesuch entries of many issues into a JSONL file.")
+    ap.add_argument("inputs", nargs="+", help="issue PDFs, directories or glob patterns (e.g. 'input/*.pdf')")
+    ap.add_argument("-o", "--output", default=os.path.join("output", "baugesuch.jsonl"))
+    ap.add_argument("--workers", type=int, default=0, help="OCR worker processes (0 = one per core)")
+    ap.add_argument("--manifest", default="", help="manifest path (default: <output>.manifest.sqlite)")
+    ap.add_argument("--debug", choices=LEVELS, default="", help="debug artefacts (default: BAUGESUCH_DEBUG or failure)")
+    ap.add_argument("--gemeinden", default="", help="comma-separated Gemeinden or 'all' (default: BAUGESUCH_GEMEINDEN)")
+    ap.add_argument("--no-resume", action="store_true", help="start a fresh output instead of skipping done issues")
+    args = ap.parse_args()
+    n = parse_baugesuch_batch(args.inputs, args.output, ocr_workers=args.workers, resume=not args.no_resume,
+                              manifest_path=args.manifest, debug=args.debug, gemeinden=args.gemeinden)
+    print(f"[INFO] {n} records written to {args.output}")
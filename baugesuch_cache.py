@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+# ================================ Configuration ================================
+
+CACHE_DIR = os.environ.get("BAUGESUCH_CACHE_DIR", os.path.join(".cache", "baugesuch"))
+
+Fingerprint = Tuple[str, int, int, str]  # (abspath, size, mtime_ns, sha256)
+
+
+# ============================== Small utilities ==============================
+
+def _atomic_write_json(path: str, data: object) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def _load_json(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+# ============================== File fingerprints ==============================
+
+_DIGESTS: Dict[Tuple[str, int, int], str] = {}
+_DIGESTS_LOCK = threading.Lock()
+
+def file_fingerprint(path: str) -> Fingerprint:
+    """
+    Identify a file by path, size, mtime and content hash.
+    The SHA-256 is only recomputed when path/size/mtime change.
+    """
+    ap = os.path.abspath(path)
+    st = os.stat(ap)
+    stat_key = (ap, st.st_size, st.st_mtime_ns)
+    with _DIGESTS_LOCK:
+        digest = _DIGESTS.get(stat_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(ap, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with _DIGESTS_LOCK:
+            _DIGESTS[stat_key] = digest
+    return ap, st.st_size, st.st_mtime_ns, digest
+
+
+# ============================== Text-layer cache ==============================
+
+class TextLayerCache:
+    """
+    Per-document page text, keyed by file fingerprint and an optional `variant`
+    (e.g. the text backend that produced it). Pages are filled lazily (each page extracted
+    at most once) and persisted as one JSON file per content hash + variant under `cache_dir/text`.
+    New pages stay in memory until `flush` (at session close, eviction or exit), so a document
+    is written once per run, not once per extracted page.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_docs: int = 16, persist: bool = True):
+        self.cache_dir = os.path.join(cache_dir or CACHE_DIR, "text")
+        self.max_docs = max_docs
+        self.persist = persist
+        self._docs: "OrderedDict[Tuple[Fingerprint, str], Dict[int, str]]" = OrderedDict()
+        self._dirty: Set[Tuple[Fingerprint, str]] = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _disk_path(self, fp: Fingerprint, variant: str) -> str:
+        suffix = "".join(ch if ch.isalnum() else "_" for ch in variant)
+        return os.path.join(self.cache_dir, f"{fp[3]}-{suffix}.json" if suffix else f"{fp[3]}.json")
+
+    def _doc(self, fp: Fingerprint, variant: str) -> Dict[int, str]:
+        """Return the in-memory page map for `fp`, loading it from disk once. Caller holds the lock."""
+        key = (fp, variant)
+        pages = self._docs.get(key)
+        if pages is not None:
+            self._docs.move_to_end(key)
+            return pages
+        pages = {}
+        if self.persist:
+            data = _load_json(self._disk_path(fp, variant))
+            if data and isinstance(data.get("pages"), dict):
+                pages = {int(k): v for k, v in data["pages"].items() if isinstance(v, str)}
+        self._docs[key] = pages
+        while len(self._docs) > self.max_docs:
+            old_key, old_pages = self._docs.popitem(last=False)
+            if old_key in self._dirty:
+                self._dirty.discard(old_key)
+                self._write(old_key, old_pages)
+        return pages
+
+    def _write(self, key: Tuple[Fingerprint, str], pages: Dict[int, str]) -> None:
+        fp, variant = key
+        try:
+            _atomic_write_json(self._disk_path(fp, variant), {
+                "path": fp[0], "size": fp[1], "mtime_ns": fp[2], "sha256": fp[3],
+                "variant": variant, "pages": {str(k): v for k, v in pages.items()},
+            })
+        except OSError:
+            pass  # cache is best-effort; memory copy still serves this run
+
+    def get(self, pdf_path: str, page1: int, variant: str = "") -> Optional[str]:
+        """Cached text of `page1`, or None if that page was never extracted."""
+        fp = file_fingerprint(pdf_path)
+        with self._lock:
+            txt = self._doc(fp, variant).get(page1)
+            if txt is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return txt
+
+    def put_pages(self, pdf_path: str, pages: Dict[int, str], variant: str = "") -> None:
+        """Merge freshly extracted pages into the document entry; written to disk on `flush`."""
+        if not pages:
+            return
+        fp = file_fingerprint(pdf_path)
+        with self._lock:
+            self._doc(fp, variant).update(pages)
+            if self.persist:
+                self._dirty.add((fp, variant))
+
+    def flush(self, pdf_path: str = "") -> None:
+        """Write the documents with unsaved pages (only those of `pdf_path` if given) to disk."""
+        ap = os.path.abspath(pdf_path) if pdf_path else ""
+        with self._lock:
+            keys = [k for k in self._dirty if not ap or k[0][0] == ap]
+            todo = [(k, dict(self._docs.get(k, {}))) for k in keys]
+            self._dirty.difference_update(keys)
+        for key, pages in todo:
+            self._write(key, pages)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs.clear()
+            self._dirty.clear()
+            self.hits = self.misses = 0
+
+
+# ================================= OCR cache =================================
+
+OCR_CACHE_MAX_BYTES = int(float(os.environ.get("BAUGESUCH_OCR_CACHE_MB") or 256) * 1024 * 1024)
+
+_OCR_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS ocr (key TEXT PRIMARY KEY, text TEXT NOT NULL,"
+    " size INTEGER NOT NULL, last_used REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ocr_last_used ON ocr (last_used)",
+    "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+)
+
+class OcrCache:
+    """
+    On-disk OCR results (SQLite under `cache_dir/ocr.sqlite`, WAL mode) keyed by image digest,
+    OCR engine and Tesseract settings, evicted least-recently-used once `max_bytes` of text is
+    exceeded. Hit/miss counters are kept per process and as running totals in the database, so
+    worker processes of the OCR pool add up. Lookups only read: last-used times and counters are
+    buffered and written in one transaction by `flush` (with the next `put`, per pool job, at exit
+    or every FLUSH_EVERY lookups), so cache hits in parallel workers do not queue for the write lock.
+    Failures degrade to cache misses.
+    """
+
+    FLUSH_EVERY = 256
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = OCR_CACHE_MAX_BYTES, enabled: bool = True):
+        self.path = os.path.join(cache_dir or CACHE_DIR, "ocr.sqlite")
+        self.max_bytes = max_bytes
+        self.enabled = enabled and max_bytes > 0
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional["sqlite3.Connection"] = None
+        self._pid = 0
+        self._touched: Dict[str, float] = {}   # key -> last_used, not yet written
+        self._counts: Dict[str, int] = {}      # "hits"/"misses" not yet added to the totals
+
+    def _db(self) -> "sqlite3.Connection":
+        import sqlite3  # lazy: only runs that actually OCR pay for it
+        # one connection per process: never reuse a handle inherited through fork
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")  # readers never wait for a writer
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for stmt in _OCR_SCHEMA:
+                conn.execute(stmt)
+            conn.commit()
+            if self._pid != os.getpid():  # buffered writes belong to the parent
+                self._touched, self._counts = {}, {}
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    @staticmethod
+    def make_key(image: bytes, engine: str, lang: str, oem: int, psm: int, *extra: str) -> str:
+        """Engines read the same image differently (tesserocr, tesseract-cli, pytesseract): part of the key."""
+        digest = hashlib.sha256(image).hexdigest()
+        return f"{digest}|{engine}|{lang}|oem{oem}|psm{psm}|{' '.join(extra)}"
+
+    def _note(self, name: str, key: str = "") -> None:
+        self._counts[name] = self._counts.get(name, 0) + 1
+        if key:
+            self._touched[key] = time.time()
+        if sum(self._counts.values()) >= self.FLUSH_EVERY:
+            self.flush()
+
+    def _write_pending(self, db: "sqlite3.Connection") -> None:
+        if self._touched:
+            db.executemany("UPDATE ocr SET last_used = ? WHERE key = ?",
+                           [(t, k) for k, t in self._touched.items()])
+        if self._counts:
+            db.executemany("INSERT INTO counters VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + ?",
+                           [(n, v, v) for n, v in self._counts.items()])
+        self._touched, self._counts = {}, {}
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        import sqlite3
+        try:
+            row = self._db().execute("SELECT text FROM ocr WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            self.misses += 1
+            return None
+        if row is None:
+            self.misses += 1
+            self._note("misses")
+            return None
+        self.hits += 1
+        self._note("hits", key)
+        return row[0]
+
+    def put(self, key: str, text: str) -> None:
+        if not self.enabled:
+            return
+        import sqlite3
+        try:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO ocr VALUES (?, ?, ?, ?)",
+                       (key, text, len(text.encode("utf-8")), time.time()))
+            self._write_pending(db)
+            self._evict(db)
+            db.commit()
+        except sqlite3.Error:
+            pass
+
+    def flush(self) -> None:
+        """Write buffered last-used times and hit/miss counts (one transaction)."""
+        if not self.enabled or self._pid != os.getpid() or not (self._touched or self._counts):
+            return
+        import sqlite3
+        try:
+            db = self._db()
+            self._write_pending(db)
+            db.commit()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, db: "sqlite3.Connection") -> None:
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM ocr").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # drop least-recently-used rows down to 90% of the budget
+        excess = total - int(self.max_bytes * 0.9)
+        for key, size in db.execute("SELECT key, size FROM ocr ORDER BY last_used").fetchall():
+            if excess <= 0:
+                break
+            db.execute("DELETE FROM ocr WHERE key = ?", (key,))
+            excess -= size
+
+    def stats(self) -> Dict[str, int]:
+        """Process-local hits/misses plus persisted totals, entry count and bytes held."""
+        out = {"hits": self.hits, "misses": self.misses,
+               "total_hits": 0, "total_misses": 0, "entries": 0, "bytes": 0}
+        if not self.enabled:
+            return out
+        import sqlite3
+        self.flush()
+        try:
+            db = self._db()
+            out["entries"], out["bytes"] = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr").fetchone()
+            for name, value in db.execute("SELECT name, value FROM counters"):
+                out[f"total_{name}"] = value
+        except sqlite3.Error:
+            pass
+        return out
+
+    def clear(self) -> None:
+        import sqlite3
+        self.hits = self.misses = 0
+        self._touched, self._counts = {}, {}
+        try:
+            db = self._db()
+            db.execute("DELETE FROM ocr")
+            db.execute("DELETE FROM counters")
+            db.commit()
+        except sqlite3.Error:
+            pass
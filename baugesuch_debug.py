@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import os
+import re
+import json
+import time
+import queue
+import shutil
+import atexit
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# ================================ Configuration ================================
+
+LEVEL_OFF = "off"
+LEVEL_FAILURE = "failure"   # only pages that produced no (or incomplete) entries
+LEVEL_ALWAYS = "always"
+LEVELS = (LEVEL_OFF, LEVEL_FAILURE, LEVEL_ALWAYS)
+
+DEBUG_LEVEL = (os.environ.get("BAUGESUCH_DEBUG") or LEVEL_FAILURE).lower()
+DEBUG_DIR = os.environ.get("BAUGESUCH_DEBUG_DIR") or ""          # default: <output dir>/debug
+DEBUG_KEEP = int(os.environ.get("BAUGESUCH_DEBUG_KEEP") or 20)   # issue folders kept per debug dir
+DEBUG_MAX_AGE_DAYS = float(os.environ.get("BAUGESUCH_DEBUG_MAX_AGE_DAYS") or 7)
+
+REQUIRED_FIELDS = ("Bauherrschaft", "Bauvorhaben", "Lage")
+
+RE_UNSAFE = re.compile(r"[^\w.-]+")
+
+MARKER = ".baugesuch-debug"  # in every issue folder this module created; nothing else is ever deleted
+
+
+# ============================== Small utilities ==============================
+
+def _safe_name(s: str) -> str:
+    return RE_UNSAFE.sub("_", s).strip("_") or "issue"
+
+def failure_reason(entries: List[Dict[str, str]]) -> str:
+    """Why a page counts as failed ("" if it did not): no entries, or a required field left empty."""
+    if not entries:
+        return "no entries"
+    for i, e in enumerate(entries):
+        missing = [f for f in REQUIRED_FIELDS if not e.get(f)]
+        if missing:
+            return f"box {i}: empty {', '.join(missing)}"
+    return ""
+
+def _pnm_to_png(pnm: bytes) -> Tuple[bytes, str]:
+    """PNG if Pillow is around (encoded in the writer thread, off the hot path), else the raw PNM."""
+    try:
+        import io
+        from PIL import Image
+    except ImportError:
+        return pnm, ".pnm"
+    buf = io.BytesIO()
+    Image.open(io.BytesIO(pnm)).save(buf, format="PNG")
+    return buf.getvalue(), ".png"
+
+
+# ================================ Retention ================================
+
+def _owned(path: str) -> bool:
+    """True if `path` is an issue folder written by this module (it holds the MARKER file)."""
+    return os.path.isfile(os.path.join(path, MARKER))
+
+def _reset_issue_dir(path: str) -> None:
+    """
+    Empty an issue folder for a rerun and mark it as ours. A same-named folder this module did
+    not create is left as it is (never marked, so never emptied or pruned).
+    """
+    if _owned(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        return
+    _write_file(os.path.join(path, MARKER), "")
+
+def prune(debug_dir: str, keep: int = DEBUG_KEEP, max_age_days: float = DEBUG_MAX_AGE_DAYS) -> int:
+    """
+    Delete issue folders beyond the newest `keep` or older than `max_age_days`; returns folders
+    removed. Only folders holding the MARKER count, so a debug dir shared with other data is safe.
+    """
+    try:
+        dirs = [os.path.join(debug_dir, d) for d in os.listdir(debug_dir)]
+    except OSError:
+        return 0
+    dirs = sorted((d for d in dirs if os.path.isdir(d) and _owned(d)), key=os.path.getmtime, reverse=True)
+    cutoff = time.time() - max_age_days * 86400 if max_age_days > 0 else None
+    removed = 0
+    for i, d in enumerate(dirs):
+        if (keep > 0 and i >= keep) or (cutoff is not None and os.path.getmtime(d) < cutoff):
+            shutil.rmtree(d, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+# ============================== Background writer ==============================
+
+class DebugWriter:
+    """
+    Writes artefacts from a daemon thread so parsing never waits on disk. The queue is
+    bounded (a burst blocks the producer instead of buffering unbounded images);
+    `flush()` waits until everything queued so far is on disk. Write errors are dropped.
+    """
+
+    def __init__(self, max_queue: int = 256):
+        self._q: "queue.Queue[Optional[Tuple[Any, ...]]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.errors = 0
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="baugesuch-debug-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            job = self._q.get()
+            try:
+                if job is not None:
+                    job[0](*job[1:])
+                    self.written += 1
+            except Exception:
+                self.errors += 1
+            finally:
+                self._q.task_done()
+
+    def submit(self, fn: Any, *args: Any) -> None:
+        self._ensure_thread()
+        self._q.put((fn, *args))
+
+    def write(self, path: str, data: Union[str, bytes]) -> None:
+        self.submit(_write_file, path, data)
+
+    def flush(self) -> None:
+        if self._thread is not None:
+            self._q.join()
+
+
+def _write_file(path: str, data: Union[str, bytes]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+
+def _write_image(path_stem: str, pnm: bytes) -> None:
+    data, ext = _pnm_to_png(pnm)
+    _write_file(path_stem + ext, data)
+
+
+WRITER = DebugWriter()
+atexit.register(WRITER.flush)
+
+
+# ================================ Public API ================================
+
+class IssueArtefacts:
+    """
+    Debug artefacts of one issue under <debug_dir>/<issue>/: per page pNNN.txt (page text),
+    pNNN.json (method, failure reason, entries) and pNNN.png for OCR'd pages.
+    Which pages get written depends on `level`.
+    """
+
+    def __init__(self, debug_dir: str, issue: str, level: str = ""):
+        self.level = (level or DEBUG_LEVEL).lower()
+        if self.level not in LEVELS:
+            self.level = LEVEL_FAILURE
+        self.debug_dir = debug_dir
+        self.dir = os.path.join(debug_dir, _safe_name(issue))
+        self._started = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.level != LEVEL_OFF and bool(self.debug_dir)
+
+    def wants(self, entries: List[Dict[str, str]]) -> bool:
+        return self.enabled and (self.level == LEVEL_ALWAYS or bool(failure_reason(entries)))
+
+    def page(self, page1: int, text: str, entries: List[Dict[str, str]], method: str = "text",
+             image: Optional[bytes] = None) -> None:
+        """Queue the artefacts of one page (caller checks `wants` first to skip rendering images)."""
+        if not self.wants(entries):
+            return
+        if not self._started:
+            # a rerun replaces the issue's old artefacts instead of mixing with them
+            WRITER.submit(_reset_issue_dir, self.dir)
+            self._started = True
+        stem = os.path.join(self.dir, f"p{page1:03d}")
+        WRITER.write(stem + ".txt", text)
+        WRITER.write(stem + ".json", json.dumps({
+            "page": page1, "method": method, "reason": failure_reason(entries), "entries": entries,
+        }, ensure_ascii=False, indent=2))
+        if image is not None:
+            WRITER.submit(_write_image, stem, image)
+
+    def close(self) -> None:
+        """Apply the retention policy once the issue is done (in the writer thread, after its files)."""
+        if self._started:
+            WRITER.submit(prune, self.debug_dir)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import re
+import json
+from typing import Dict, Optional
+
+# ================================ Configuration ================================
+
+LEXICON_PATH = os.environ.get("BAUGESUCH_LEXICON") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "resources", "corrections.json")
+
+SCOPE_ALL = "all"  # entries applied to every field
+
+
+# ================================ Trie replacer ================================
+
+def _trie_pattern(words: Dict[str, str]) -> str:
+    """
+    Regex for the keys of `words`, built from their character trie: shared prefixes are
+    matched once and a key that is a prefix of another is optional, so the longest key wins.
+    """
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def emit(node: dict) -> str:
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+class TrieReplacer:
+    """All replacements of a table in one left-to-right scan (leftmost, then longest key)."""
+
+    def __init__(self, table: Dict[str, str]):
+        self.table = {k: v for k, v in table.items() if k}
+        self.pattern = re.compile(_trie_pattern(self.table)) if self.table else None
+
+    def __call__(self, s: str) -> str:
+        """`s` itself (same object, str subclass kept) when nothing matches, else the rewritten str."""
+        if self.pattern is None or not s:
+            return s
+        out, n = self.pattern.subn(self._repl, s)
+        return out if n else s
+
+    def _repl(self, m: "re.Match[str]") -> str:
+        return self.table[m.group()]
+
+
+# ================================== Lexicon ==================================
+
+class Lexicon:
+    """
+    OCR/spelling corrections from a JSON file: {"all": {wrong: right}, "<Field>": {wrong: right}, ...}.
+    Each field gets one TrieReplacer over its own entries plus "all" (field entries win),
+    so a growing lexicon never adds passes. Keys starting with "_" are comments.
+    """
+
+    def __init__(self, scopes: Optional[Dict[str, Dict[str, str]]] = None):
+        self.scopes = {k: dict(v) for k, v in (scopes or {}).items() if not k.startswith("_") and isinstance(v, dict)}
+        self._replacers: Dict[str, TrieReplacer] = {}
+
+    @classmethod
+    def load(cls, path: str = "") -> "Lexicon":
+        """Read a lexicon file; a missing default file gives an empty lexicon."""
+        path = path or LEXICON_PATH
+        if not os.path.isfile(path) and path == LEXICON_PATH:
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"Correction lexicon must be a JSON object: {path}")
+        return cls(data)
+
+    def replacer(self, field: str) -> TrieReplacer:
+        r = self._replacers.get(field)
+        if r is None:
+            r = self._replacers[field] = TrieReplacer({**self.scopes.get(SCOPE_ALL, {}), **self.scopes.get(field, {})})
+        return r
+
+    def correct(self, field: str, s: str) -> str:
+        return self.replacer(field)(s)
+
+
+_LEXICON: Optional[Lexicon] = None
+
+def get_lexicon() -> Lexicon:
+    """Process-wide lexicon from LEXICON_PATH, loaded on first use."""
+    global _LEXICON
+    if _LEXICON is None:
+        _LEXICON = Lexicon.load()
+    return _LEXICON
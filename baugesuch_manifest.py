@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import json
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from baugesuch_cache import file_fingerprint
+
+# ================================== Schema ==================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    pdf        TEXT PRIMARY KEY,   -- absolute path of the input PDF
+    size       INTEGER NOT NULL,
+    mtime_ns   INTEGER NOT NULL,
+    sha256     TEXT NOT NULL,
+    pages      TEXT NOT NULL,      -- JSON list of scanned pages (1-based)
+    methods    TEXT NOT NULL,      -- JSON {page: "text" | "ocr" | "ocr_failed"}
+    output     TEXT NOT NULL,      -- absolute path of the JSONL sink
+    records    INTEGER NOT NULL,
+    status     TEXT NOT NULL,      -- "running" until every record is flushed, then "done" ("failed" if OCR broke)
+    updated_at TEXT NOT NULL,
+    selection  TEXT NOT NULL DEFAULT ''  -- what was extracted: Gemeinden and scan mode (see `selection`)
+)
+"""
+
+_COLUMNS = ("pdf", "size", "mtime_ns", "sha256", "pages", "methods", "output", "records", "status",
+            "updated_at", "selection")
+
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"  # finished, but OCR broke on a page: redone on resume
+
+def selection(gemeinden: List[str], scan_all: bool) -> str:
+    """Canonical description of what a run extracts; an issue done under another selection is redone."""
+    return json.dumps({"gemeinden": sorted(gemeinden), "scan_all": bool(scan_all)}, ensure_ascii=False)
+
+
+# ================================= Manifest =================================
+
+class Manifest:
+    """
+    SQLite record of processed issues: input fingerprint, pages scanned, extraction method
+    per page and where the records went. Lets batch reruns skip unchanged issues.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute(_SCHEMA)
+        have = {r["name"] for r in self._db.execute("PRAGMA table_info(issues)")}
+        if "selection" not in have:  # manifests written before the selection was recorded
+            self._db.execute("ALTER TABLE issues ADD COLUMN selection TEXT NOT NULL DEFAULT ''")
+        self._db.commit()
+
+    def __enter__(self) -> "Manifest":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def lookup(self, pdf_path: str) -> Optional[Dict[str, Any]]:
+        row = self._db.execute("SELECT * FROM issues WHERE pdf = ?", (os.path.abspath(pdf_path),)).fetchone()
+        if row is None:
+            return None
+        d = dict(row)
+        d["pages"] = json.loads(d["pages"])
+        d["methods"] = {int(k): v for k, v in json.loads(d["methods"]).items()}
+        return d
+
+    def is_current(self, pdf_path: str, output: str, selection: str = "") -> bool:
+        """
+        True if `pdf_path` was fully processed into `output` under the same `selection`
+        (Gemeinden and scan mode) and has not changed since.
+        Size + mtime match is trusted without hashing; otherwise the content hash decides
+        (a touched-but-identical file is re-stamped and still counts as current).
+        """
+        row = self.lookup(pdf_path)
+        if not row or row["status"] != STATUS_DONE or row["output"] != os.path.abspath(output):
+            return False
+        if row["selection"] != selection:
+            return False
+        st = os.stat(pdf_path)
+        if st.st_size == row["size"] and st.st_mtime_ns == row["mtime_ns"]:
+            return True
+        ap, size, mtime_ns, sha = file_fingerprint(pdf_path)
+        if sha != row["sha256"]:
+            return False
+        self._db.execute("UPDATE issues SET size = ?, mtime_ns = ? WHERE pdf = ?", (size, mtime_ns, ap))
+        self._db.commit()
+        return True
+
+    def _upsert(self, pdf_path: str, output: str, pages: List[int], methods: Dict[int, str],
+                records: int, status: str, selection: str) -> None:
+        ap, size, mtime_ns, sha = file_fingerprint(pdf_path)
+        self._db.execute(
+            f"INSERT OR REPLACE INTO issues ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+            (ap, size, mtime_ns, sha, json.dumps(pages), json.dumps({str(k): v for k, v in methods.items()}),
+             os.path.abspath(output), records, status, time.strftime("%Y-%m-%dT%H:%M:%S"), selection),
+        )
+        self._db.commit()
+
+    def start(self, pdf_path: str, output: str, selection: str = "") -> None:
+        """Mark an issue as in progress (a crash leaves it 'running', so it is redone)."""
+        self._upsert(pdf_path, output, [], {}, 0, STATUS_RUNNING, selection)
+
+    def finish(self, pdf_path: str, output: str, pages: List[int], methods: Dict[int, str], records: int,
+               selection: str = "") -> str:
+        """
+        Record a finished issue: "done", or "failed" if OCR broke on any page (a missing engine,
+        errors or timeouts), so it is not skipped as current once OCR works. Returns the status.
+        """
+        status = STATUS_FAILED if "ocr_failed" in methods.values() else STATUS_DONE
+        self._upsert(pdf_path, output, pages, methods, records, status, selection)
+        return status
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# ================================ Configuration ================================
+
+METRICS_ENABLED = (os.environ.get("BAUGESUCH_METRICS") or "1") != "0"
+PROM_PREFIX = "baugesuch"
+
+Snapshot = Dict[str, Dict[str, Any]]  # {"spans": {name: {...}}, "counters": {name: int}}
+
+
+# ================================== Registry ==================================
+
+class Metrics:
+    """
+    Process-wide timing spans and event counters. Spans accumulate calls, total and max
+    seconds per stage name; counters are plain integers. Everything is cumulative (like
+    Prometheus counters); take a `snapshot()` before a run and `diff()` after it for per-run numbers.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._spans: Dict[str, List[float]] = {}   # name -> [calls, total_s, max_s]
+        self._counters: Dict[str, int] = {}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block under `name` (recorded even if it raises)."""
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0)
+
+    def observe(self, name: str, seconds: float, calls: int = 1) -> None:
+        with self._lock:
+            s = self._spans.get(name)
+            if s is None:
+                self._spans[name] = [calls, seconds, seconds]
+            else:
+                s[0] += calls
+                s[1] += seconds
+                s[2] = max(s[2], seconds)
+
+    def incr(self, name: str, n: int = 1) -> None:
+        if not self.enabled or not n:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def snapshot(self) -> Snapshot:
+        with self._lock:
+            return {
+                "spans": {k: {"calls": int(v[0]), "seconds": v[1], "max_seconds": v[2]} for k, v in self._spans.items()},
+                "counters": dict(self._counters),
+            }
+
+    def merge(self, snap: Snapshot) -> None:
+        """Add a snapshot taken elsewhere (e.g. in an OCR worker process)."""
+        with self._lock:
+            for name, s in snap.get("spans", {}).items():
+                cur = self._spans.setdefault(name, [0, 0.0, 0.0])
+                cur[0] += s["calls"]
+                cur[1] += s["seconds"]
+                cur[2] = max(cur[2], s["max_seconds"])
+            for name, n in snap.get("counters", {}).items():
+                self._counters[name] = self._counters.get(name, 0) + n
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+
+METRICS = Metrics()
+
+
+# ================================== Exports ==================================
+
+def diff(before: Snapshot, after: Snapshot) -> Snapshot:
+    """What happened between two snapshots (max_seconds is the later cumulative max)."""
+    spans: Dict[str, Dict[str, Any]] = {}
+    for name, s in after["spans"].items():
+        b = before["spans"].get(name, {"calls": 0, "seconds": 0.0})
+        if s["calls"] > b["calls"]:
+            spans[name] = {"calls": s["calls"] - b["calls"], "seconds": s["seconds"] - b["seconds"],
+                           "max_seconds": s["max_seconds"]}
+    counters = {k: v - before["counters"].get(k, 0) for k, v in after["counters"].items()
+                if v != before["counters"].get(k, 0)}
+    return {"spans": spans, "counters": counters}
+
+def to_json(snap: Optional[Snapshot] = None) -> str:
+    return json.dumps(snap if snap is not None else METRICS.snapshot(), ensure_ascii=False, indent=2, sort_keys=True)
+
+def to_prometheus(snap: Optional[Snapshot] = None, prefix: str = PROM_PREFIX) -> str:
+    """Prometheus text exposition format (for a node_exporter textfile collector or a push gateway)."""
+    snap = snap if snap is not None else METRICS.snapshot()
+    lines: List[str] = []
+    spans = sorted(snap["spans"].items())
+    for metric, field, help_ in (
+        ("span_calls_total", "calls", "Times each pipeline stage ran."),
+        ("span_seconds_total", "seconds", "Wall-clock seconds spent per pipeline stage."),
+        ("span_seconds_max", "max_seconds", "Slowest single run per pipeline stage."),
+    ):
+        lines.append(f"# HELP {prefix}_{metric} {help_}")
+        lines.append(f"# TYPE {prefix}_{metric} {'gauge' if metric.endswith('max') else 'counter'}")
+        lines.extend(f'{prefix}_{metric}{{span="{name}"}} {s[field]:.6g}' for name, s in spans)
+    for name, value in sorted(snap["counters"].items()):
+        lines.append(f"# TYPE {prefix}_{name}_total counter")
+        lines.append(f"{prefix}_{name}_total {value}")
+    return "\n".join(lines) + "\n"
+
+def format_table(snap: Snapshot) -> str:
+    """Plain-text summary: spans by total time, then counters."""
+    rows = [f"{'span':<24} {'calls':>6} {'total s':>9} {'max s':>8}"]
+    for name, s in sorted(snap["spans"].items(), key=lambda kv: -kv[1]["seconds"]):
+        rows.append(f"{name:<24} {s['calls']:>6} {s['seconds']:>9.3f} {s['max_seconds']:>8.3f}")
+    rows.extend(f"{name:<24} {value:>6}" for name, value in sorted(snap["counters"].items()))
+    return "\n".join(rows)
+
+def log_to_robot(snap: Snapshot) -> None:
+    """Write the summary into the Robot Framework log when running under Robot (no-op otherwise or with metrics off)."""
+    if not METRICS.enabled or "robot" not in sys.modules:
+        return
+    try:
+        from robot.api import logger
+        from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+    except ImportError:
+        return
+    try:
+        BuiltIn().get_variable_value("${OUTPUT DIR}")
+    except RobotNotRunningError:
+        return
+    logger.info("Baugesuch metrics\n" + format_table(snap))
+
+def write_reports(out_dir: str, snap: Snapshot) -> None:
+    """
+    metrics.json with `snap` (one run) and metrics.prom with the process totals (cumulative
+    since the process started, as Prometheus counters are) next to the output JSON.
+    Nothing is written when metrics are off (BAUGESUCH_METRICS=0).
+    """
+    if not METRICS.enabled:
+        return
+    with open(os.path.join(out_dir, "metrics.json"), "w", encoding="utf-8") as f:
+        f.write(to_json(snap))
+    with open(os.path.join(out_dir, "metrics.prom"), "w", encoding="utf-8") as f:
+        f.write(to_prometheus())
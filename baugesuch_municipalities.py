@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import os
+import re
+import json
+import unicodedata
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+# ================================ Configuration ================================
+
+MUNICIPALITIES_PATH = os.environ.get("BAUGESUCH_MUNICIPALITIES_FILE") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "resources", "municipalities.json")
+
+# which Gemeinden a parse returns: comma-separated names, or "all"
+SELECTION = os.environ.get("BAUGESUCH_GEMEINDEN") or "Würenlos"
+
+_UMLAUTS = {"ä": "a", "ö": "o", "ü": "u"}
+
+
+# ============================== Small utilities ==============================
+
+def _fold(s: str) -> str:
+    """Accent- and case-insensitive key ("Würenlos" -> "wurenlos")."""
+    d = unicodedata.normalize("NFKD", s or "")
+    return "".join(ch for ch in d.lower() if not unicodedata.combining(ch)).strip()
+
+def _tolerant(text: str) -> str:
+    """Regex for `text` as PDFs/OCR spell it: ü/ue/u (same for ä, ö), any whitespace, loose hyphens."""
+    out: List[str] = []
+    for ch in unicodedata.normalize("NFC", text):
+        base = _UMLAUTS.get(ch.lower())
+        if base:
+            out.append(f"(?:{re.escape(ch)}|{base}e?)")
+        elif ch.isspace():
+            out.append(r"\s+")
+        elif ch == "-":
+            out.append(r"\s*-\s*")
+        else:
+            out.append(re.escape(ch))
+    return "".join(out)
+
+
+# ================================ Registry ================================
+
+class Municipality(NamedTuple):
+    key: str                 # folded name, stable id
+    name: str                # display name, goes into the "Gemeinde" field
+    plz: tuple               # postal codes
+    variants: tuple          # other spellings of the name (ASCII, abbreviations, ...)
+    footer: str              # canonical box footer, e.g. "BAUVERWALTUNG WÜRENLOS"
+
+class Matchers(NamedTuple):
+    """Combined regexes over every registered municipality (rebuilt when the registry changes)."""
+    footer_named: str                 # footer alternation, group f<i> per municipality (for composing)
+    footer_any: str                   # the same without groups
+    footer: "re.Pattern[str]"         # footer_named, compiled (re.I)
+    hints: "re.Pattern[str]"          # names, variants and PLZ, group h<i> per municipality
+    gemeinde_gap: "re.Pattern[str]"   # "...gemeinde" glued to a registered name
+    footer_word: "re.Pattern[str]"    # first footer word of an OCR/layout word list
+    footer_tail: "re.Pattern[str]"    # the name word right after it
+
+class MunicipalityRegistry:
+    """
+    Gemeinden whose Baugesuche appear in the paper: name variants, postal codes and footer.
+    All of them are compiled into one footer alternation and one hint alternation, so every
+    box on a page is classified in the same scan that finds it.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]] = ()):
+        self._items: List[Municipality] = []
+        self._matchers: Optional[Matchers] = None
+        for e in entries:
+            self.add(**e)
+
+    @classmethod
+    def load(cls, path: str = "") -> "MunicipalityRegistry":
+        path = path or MUNICIPALITIES_PATH
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        entries = data.get("municipalities") if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            raise ValueError(f"Municipality registry must hold a 'municipalities' list: {path}")
+        return cls(entries)
+
+    def add(self, name: str, plz: Iterable[str] = (), variants: Iterable[str] = (), footer: str = "",
+            **_: Any) -> Municipality:
+        """Register (or replace, by name) a municipality; the footer defaults to "BAUVERWALTUNG <NAME>"."""
+        name = unicodedata.normalize("NFC", name)
+        m = Municipality(_fold(name), name, tuple(str(p) for p in plz), tuple(variants),
+                         footer or f"BAUVERWALTUNG {name.upper()}")
+        self._items = [x for x in self._items if x.key != m.key] + [m]
+        self._matchers = None
+        return m
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, name: str) -> Optional[Municipality]:
+        """Look up by name or variant, ignoring case and accents."""
+        k = _fold(name)
+        for m in self._items:
+            if k == m.key or k in (_fold(v) for v in m.variants):
+                return m
+        return None
+
+    def select(self, spec: str = "") -> List[Municipality]:
+        """Municipalities named in `spec` (comma-separated, or "all"); defaults to SELECTION."""
+        spec = (spec or SELECTION).strip()
+        if spec.lower() == "all":
+            return list(self._items)
+        out: List[Municipality] = []
+        for part in (p.strip() for p in spec.split(",")):
+            if not part:
+                continue
+            m = self.get(part)
+            if m is None:
+                raise ValueError(f"Unknown Gemeinde {part!r}; registered: {', '.join(x.name for x in self._items)}")
+            if m not in out:
+                out.append(m)
+        return out
+
+    @property
+    def matchers(self) -> Matchers:
+        if self._matchers is None:
+            self._matchers = self._compile()
+        return self._matchers
+
+    def _compile(self) -> Matchers:
+        footers = [_tolerant(m.footer) for m in self._items] or ["(?!)"]
+        footer_named = "(?:" + "|".join(f"(?P<f{i}>{f})" for i, f in enumerate(footers)) + ")"
+        footer_any = "(?:" + "|".join(footers) + ")"
+        hints = []
+        for i, m in enumerate(self._items):
+            alts = [_tolerant(n) for n in (m.name, *m.variants)] + [re.escape(p) for p in m.plz]
+            hints.append(rf"(?P<h{i}>\b(?:{'|'.join(alts)})\b)")
+        names = "|".join(_tolerant(n) for m in self._items for n in (m.name, *m.variants)) or "(?!)"
+        words = sorted({m.footer.split()[0][:10] for m in self._items if m.footer.split()}) or ["(?!)"]
+        tails = sorted({_tolerant(n.split()[0]) for m in self._items for n in (m.name, *m.variants)}) or ["(?!)"]
+        return Matchers(
+            footer_named=footer_named,
+            footer_any=footer_any,
+            footer=re.compile(footer_named, re.I),
+            hints=re.compile("|".join(hints) or "(?!)", re.I),
+            gemeinde_gap=re.compile(rf"(gemeinde)(?=(?:{names})\b)", re.I),
+            footer_word=re.compile("^(?:" + "|".join(re.escape(w) for w in words) + ")"),
+            footer_tail=re.compile(r"^(?:" + "|".join(t[:1] + r"\W?" + t[1:] if t[:1].isalpha() else t
+                                                     for t in tails) + ")", re.I),
+        )
+
+    def from_group(self, group: Optional[str]) -> Optional[Municipality]:
+        """Municipality behind a f<i>/h<i> group name of the combined matchers."""
+        if not group or not group[1:].isdigit():
+            return None
+        i = int(group[1:])
+        return self._items[i] if i < len(self._items) else None
+
+    def classify(self, text: str) -> Optional[Municipality]:
+        """The box's Gemeinde: its footer if present, else the most mentioned name/PLZ (earliest on ties)."""
+        mt = self.matchers
+        m = mt.footer.search(text)
+        if m:
+            return self.from_group(m.lastgroup)
+        votes: Dict[str, int] = {}
+        for h in mt.hints.finditer(text):
+            votes[h.lastgroup] = votes.get(h.lastgroup, 0) + 1
+        if not votes:
+            return None
+        return self.from_group(max(votes, key=votes.__getitem__))  # dicts keep first-seen order for ties
+
+    def canonical_footer(self, text: str) -> str:
+        """Canonical spelling of the (possibly repeated/OCR-mangled) footer in `text`."""
+        m = self.matchers.footer.search(text)
+        mu = self.from_group(m.lastgroup) if m else None
+        return mu.footer if mu else text
+
+
+_REGISTRY: Optional[MunicipalityRegistry] = None
+
+def get_registry() -> MunicipalityRegistry:
+    """Process-wide registry from MUNICIPALITIES_PATH, loaded on first use."""
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = MunicipalityRegistry.load()
+    return _REGISTRY
@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+import os
+import importlib.util
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# ================================ Configuration ================================
+
+# Pre-OCR steps, comma-separated in order (see STEPS); overrides the render profile's. "off" = none.
+PREPROCESS = os.environ.get("BAUGESUCH_PREPROCESS")
+
+MAX_SKEW_DEG = 2.0       # skew search range (±), scanned newspaper pages are rarely off by more
+SKEW_STEP_DEG = 0.1
+MIN_SKEW_DEG = 0.15      # below this deskewing is not worth a copy of the image
+SKEW_SAMPLE = 200_000    # ink pixels used for the skew estimate
+
+SAUVOLA_WINDOW = 32      # px; statistics are taken per half-window tile, smoothed over 3x3 tiles
+SAUVOLA_K = 0.2
+SAUVOLA_R = 128.0
+
+# Rules and box borders, in PDF points (steps and segmentation get the render's px per pt):
+# straight ink runs at least RULE_MIN_PT long and at most RULE_MAX_THICK_PT thick across.
+# Headline strokes, logos and photos are as long but much thicker, so they stay.
+RULE_MIN_PT = 40.0
+RULE_MAX_THICK_PT = 1.0
+
+INK, PAPER = 0, 255
+
+# Layout segmentation (segment_blocks), in PDF points so they hold at any render scale.
+COLUMN_GAP_PT = 6.0      # blank columns needed to split side by side (wider than a label/value gap)
+SECTION_GAP_PT = 8.0     # blank rows needed to split stacked blocks (wider than line spacing)
+MIN_BLOCK_PT = 4.0       # smaller blocks are specks or stray marks
+MAX_BLOCK_INK = 0.6      # denser blocks are pictures or solid bars, not text
+SEGMENT_NOISE = 400      # a row/column with at most 1/SEGMENT_NOISE of its extent in ink counts as blank
+
+
+# ============================== Small utilities ==============================
+
+_AVAILABLE: Optional[bool] = None
+
+def available() -> bool:
+    """True if NumPy can be imported (checked once, without importing it)."""
+    global _AVAILABLE
+    if _AVAILABLE is None:
+        try:
+            _AVAILABLE = importlib.util.find_spec("numpy") is not None
+        except (ImportError, ValueError):
+            _AVAILABLE = False
+    return _AVAILABLE
+
+def bitmap_array(bmp: Any) -> Any:
+    """Zero-copy (height, width) uint8 view of a gray pypdfium2 bitmap buffer (row padding sliced off)."""
+    import numpy as np
+    buf = np.frombuffer(bmp.buffer, dtype=np.uint8)
+    return buf[:bmp.stride * bmp.height].reshape(bmp.height, bmp.stride)[:, :bmp.width]
+
+def otsu_threshold(gray: Any) -> int:
+    """Otsu's global threshold from the 256-bin histogram: gray <= threshold is ink."""
+    import numpy as np
+    hist = np.zeros(256, np.float64)
+    for y in range(0, gray.shape[0], 256):  # bincount widens to intp: keep that to a band of rows
+        hist += np.bincount(gray[y:y + 256].ravel(), minlength=256)
+    omega = np.cumsum(hist) / gray.size
+    mu = np.cumsum(hist * np.arange(256)) / gray.size
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (mu[-1] * omega - mu) ** 2 / (omega * (1.0 - omega))
+    if not np.isfinite(between).any():
+        return 127  # a single gray level: nothing to separate
+    return int(np.nanargmax(np.where(np.isfinite(between), between, np.nan)))
+
+def _is_binary(img: Any) -> bool:
+    import numpy as np
+    return not np.any((img != INK) & (img != PAPER))
+
+def _ink(img: Any) -> Any:
+    """Boolean ink mask: exact for binarized images, Otsu for gray ones."""
+    return img < 128 if _is_binary(img) else img <= otsu_threshold(img)
+
+
+# ================================ Step registry ================================
+
+Step = Callable[[Any, Any, float], Tuple[Any, Any]]
+
+STEPS: Dict[str, Step] = {}
+BINARIZERS = ("otsu", "sauvola")
+
+def register_step(name: str) -> Callable[[Step], Step]:
+    """
+    Decorator: make `fn(img, ink, px_per_pt) -> (img, ink)` usable as step `name`. `img` is a
+    uint8 (h, w) array (0 ink / 255 paper), `ink` its boolean ink mask, which a step keeps in
+    step with its output, so the mask is thresholded once per image, not once per step.
+    """
+    def deco(fn: Step) -> Step:
+        STEPS[name] = fn
+        return fn
+    return deco
+
+def parse_steps(spec: str) -> List[str]:
+    names = [] if spec.strip().lower() in ("", "off", "none") else [n.strip() for n in spec.split(",") if n.strip()]
+    unknown = [n for n in names if n not in STEPS]
+    if unknown:
+        raise ValueError(f"Unknown preprocessing step(s) {', '.join(unknown)}; known: {', '.join(STEPS)}")
+    return names
+
+def binarizes(spec: str) -> bool:
+    """True if `spec` has a step whose output is already black and white."""
+    return any(n in BINARIZERS for n in parse_steps(spec))
+
+def run(gray: Any, spec: str, px_per_pt: float = 1.0) -> Any:
+    """
+    Apply the comma-separated steps of `spec` in order to an image rendered at `px_per_pt`
+    (the render scale); `gray` itself is never modified.
+    """
+    names = parse_steps(spec)
+    if not names:
+        return gray
+    img, ink = gray, _ink(gray)
+    for name in names:
+        img, ink = STEPS[name](img, ink, px_per_pt)
+    return img
+
+def pnm_array(pnm: bytes) -> Any:
+    """Zero-copy (height, width) uint8 view of a gray (P5) PNM image."""
+    import numpy as np
+    magic, dims, maxval, pixels = pnm.split(b"\n", 3)
+    w, h = (int(v) for v in dims.split())
+    return np.frombuffer(pixels, dtype=np.uint8, count=w * h).reshape(h, w)
+
+
+# ================================ Binarization ================================
+
+@register_step("otsu")
+def binarize_otsu(img: Any, ink: Any, px_per_pt: float = 1.0) -> Tuple[Any, Any]:
+    """The ink mask (Otsu's threshold of the input) as a black and white image."""
+    import numpy as np
+    return np.where(ink, np.uint8(INK), np.uint8(PAPER)), ink
+
+@register_step("sauvola")
+def binarize_sauvola(img: Any, ink: Any = None, px_per_pt: float = 1.0, window: int = SAUVOLA_WINDOW,
+                     k: float = SAUVOLA_K, r: float = SAUVOLA_R) -> Tuple[Any, Any]:
+    """
+    Sauvola's local threshold T = m * (1 + k * (s / r - 1)), with mean m and deviation s per
+    half-window tile, smoothed over 3x3 tiles. Works band by band (one tile row at a time),
+    so the float temporaries stay at one band instead of several full-page copies.
+    """
+    import numpy as np
+    h, w = img.shape
+    b = max(4, window // 2)
+    th, tw = -(-h // b), -(-w // b)
+    mean = np.empty((th, tw), np.float32)
+    sq = np.empty((th, tw), np.float32)
+    for i in range(th):
+        band = img[i * b:(i + 1) * b]
+        band = np.pad(band, ((0, b - band.shape[0]), (0, tw * b - w)), mode="edge").astype(np.float32)
+        tiles = band.reshape(b, tw, b)
+        mean[i] = tiles.mean(axis=(0, 2))
+        sq[i] = (tiles * tiles).mean(axis=(0, 2))
+
+    def smooth(a: Any) -> Any:
+        p = np.pad(a, 1, mode="edge")
+        return sum(p[dy:dy + th, dx:dx + tw] for dy in range(3) for dx in range(3)) / 9.0
+
+    m, m2 = smooth(mean), smooth(sq)
+    thresh = m * (1.0 + k * (np.sqrt(np.maximum(m2 - m * m, 0.0)) / r - 1.0))
+    mask = np.empty(img.shape, bool)
+    for i in range(th):
+        rows = slice(i * b, min((i + 1) * b, h))
+        mask[rows] = img[rows] <= np.repeat(thresh[i], b)[:w]
+    return np.where(mask, np.uint8(INK), np.uint8(PAPER)), mask
+
+
+# ==================================== Deskew ====================================
+
+def estimate_skew(img: Any, ink: Any = None) -> float:
+    """
+    Skew angle in degrees (text lines running y = y0 + x * tan(angle)), found by projecting
+    a sample of ink pixels onto rows for every candidate angle and keeping the sharpest
+    profile (largest sum of squared row counts). Returns 0.0 on near-empty images.
+    """
+    import numpy as np
+    ys, xs = np.nonzero((_ink(img) if ink is None else ink)[::2, ::2])
+    if len(ys) < 100:
+        return 0.0
+    if len(ys) > SKEW_SAMPLE:
+        step = len(ys) // SKEW_SAMPLE + 1
+        ys, xs = ys[::step], xs[::step]
+    ys, xs = ys.astype(np.float64), xs.astype(np.float64)
+    best, best_score = 0.0, -1.0
+    for deg in np.arange(-MAX_SKEW_DEG, MAX_SKEW_DEG + SKEW_STEP_DEG / 2, SKEW_STEP_DEG):
+        rows = np.rint(ys - xs * np.tan(np.deg2rad(deg))).astype(np.int64)
+        hist = np.bincount(rows - rows.min())
+        score = float(np.dot(hist, hist))
+        if score > best_score:
+            best, best_score = float(deg), score
+    return round(best, 2)
+
+def _shear(a: Any, angle: float, fill: Any) -> Any:
+    """Shift every column of `a` vertically by x * tan(angle) (0 at the centre), one slice copy per run of columns."""
+    import numpy as np
+    h, w = a.shape
+    shift = np.rint(np.arange(w) * np.tan(np.deg2rad(angle))).astype(np.int64)
+    shift -= shift[w // 2]
+    out = np.full_like(a, fill)
+    bounds = np.flatnonzero(np.diff(shift)) + 1
+    for c0, c1 in zip(np.r_[0, bounds], np.r_[bounds, w]):
+        s = int(shift[c0])
+        if s >= h or -s >= h:
+            continue
+        if s >= 0:
+            out[:h - s, c0:c1] = a[s:, c0:c1]
+        else:
+            out[-s:, c0:c1] = a[:h + s, c0:c1]
+    return out
+
+@register_step("deskew")
+def deskew(img: Any, ink: Any = None, px_per_pt: float = 1.0) -> Tuple[Any, Any]:
+    """
+    Undo the estimated skew with a vertical shear of the image and its ink mask: each run of
+    columns sharing one shift is moved by a single slice copy, so the cost is one pass, not per pixel.
+    """
+    ink = _ink(img) if ink is None else ink
+    angle = estimate_skew(img, ink)
+    if abs(angle) < MIN_SKEW_DEG:
+        return img, ink
+    return _shear(img, angle, PAPER), _shear(ink, angle, False)
+
+
+# ================================= Rule removal =================================
+
+def _long_runs(ink: Any, length: int) -> Any:
+    """
+    Mask of ink pixels lying in a vertical run of at least `length`: an erosion then a dilation
+    by a `length`-pixel line, each built from ~log2(length) shifted boolean ANDs/ORs.
+    """
+    import numpy as np
+    h = ink.shape[0]
+    if h < length:
+        return np.zeros_like(ink)
+    run, span = ink, 1
+    while span < length:             # run[i]: rows i .. i+span-1 are all ink
+        step = min(span, length - span)
+        run = run[:-step] & run[step:]
+        span += step
+    cover = np.zeros_like(ink)
+    cover[:len(run)] = run
+    span = 1
+    while span < length:             # cover[y]: some full run starts in y-span+1 .. y
+        step = min(span, length - span)
+        cover[step:] |= cover[:-step]
+        span += step
+    return cover
+
+def rule_masks(ink: Any, px_per_pt: float = 1.0, max_thick_pt: Optional[float] = RULE_MAX_THICK_PT) -> Tuple[Any, Any]:
+    """
+    Ink pixels on straight rules, vertical and horizontal: in a vertical (horizontal) run of
+    RULE_MIN_PT or more whose horizontal (vertical) extent there is at most `max_thick_pt`
+    (None: any, so photo edges and solid bars count too).
+    """
+    length = max(2, int(RULE_MIN_PT * px_per_pt))
+    v = _long_runs(ink, length)
+    h = _long_runs(ink.T, length).T
+    if max_thick_pt is not None:
+        thick = max(1, int(round(max_thick_pt * px_per_pt)))
+        v &= ~_long_runs(v.T, thick + 1).T
+        h &= ~_long_runs(h, thick + 1)
+    return v, h
+
+@register_step("rules")
+def remove_rules(img: Any, ink: Any = None, px_per_pt: float = 1.0) -> Tuple[Any, Any]:
+    """Erase vertical column rules and horizontal box borders (see `rule_masks`)."""
+    ink = _ink(img) if ink is None else ink
+    v, h = rule_masks(ink, px_per_pt)
+    rules = v | h
+    if not rules.any():
+        return img, ink
+    out = img.copy()
+    out[rules] = PAPER
+    return out, ink & ~rules
+
+
+# =================================== Despeckle ===================================
+
+@register_step("despeckle")
+def despeckle(img: Any, ink: Any = None, px_per_pt: float = 1.0) -> Tuple[Any, Any]:
+    """Erase isolated ink pixels (no ink among their 8 neighbours): scanner dust, halftone noise."""
+    import numpy as np
+    ink = _ink(img) if ink is None else ink
+    h, w = ink.shape
+    p = np.pad(ink, 1).view(np.uint8)
+    neighbours = np.zeros((h, w), np.uint8)
+    for dy in range(3):
+        for dx in range(3):
+            if dy != 1 or dx != 1:
+                neighbours += p[dy:dy + h, dx:dx + w]
+    lonely = ink & (neighbours == 0)
+    if not lonely.any():
+        return img, ink
+    out = img.copy()
+    out[lonely] = PAPER
+    return out, ink & ~lonely
+
+
+# ============================== Layout segmentation ==============================
+
+Block = Tuple[int, int, int, int]  # (x0, y0, x1, y1) in pixels
+
+def _runs(mask: Any) -> Tuple[Any, Any]:
+    """Start and end (exclusive) indices of the True runs of a 1-D mask."""
+    import numpy as np
+    edges = np.diff(np.r_[0, mask.astype(np.int8), 0])
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+def _cuts(counts: Any, ruled: Any, min_gap: int) -> Tuple[List[int], float]:
+    """
+    Cut positions (gap middles) in a trimmed projection profile and the best gap's score: blank
+    runs at least `min_gap` long, or of any length if they hold a rule, which then scores 4x.
+    """
+    cuts: List[int] = []
+    best = 0.0
+    for s, e in zip(*_runs(counts == 0)):
+        has_rule = bool(ruled[s:e].any())
+        if has_rule or e - s >= min_gap:
+            cuts.append(int(s + e) // 2)
+            best = max(best, (e - s) * (4.0 if has_rule else 1.0))
+    return cuts, best
+
+def segment_blocks(img: Any, px_per_pt: float = 1.0) -> List[Block]:
+    """
+    Split a page image into text blocks in reading order with a recursive XY cut: each block is
+    cut at its blank rows or columns (whichever holds the wider gap; a column rule or box border
+    counts as a gap of any width), until neither is left. Rules are taken out of the ink first,
+    so bordered boxes side by side come out as separate blocks. Consecutive pieces of one
+    column are merged again, so a column or box is one block, not one per paragraph.
+    """
+    import numpy as np
+    ink = _ink(img)
+    # any long run separates blocks here, thin or not: photos and bars are not text either
+    v_rules, h_rules = rule_masks(ink, px_per_pt, None)
+    text = ink & ~(v_rules | h_rules)
+    gap_x = max(2, int(COLUMN_GAP_PT * px_per_pt))
+    gap_y = max(2, int(SECTION_GAP_PT * px_per_pt))
+    min_px = max(2, int(MIN_BLOCK_PT * px_per_pt))
+
+    def cut(y0: int, y1: int, x0: int, x1: int) -> List[Tuple[Block, bool]]:
+        sub = text[y0:y1, x0:x1]
+        rows = sub.sum(axis=1)
+        cols = sub.sum(axis=0)
+        rows[rows <= max(1, (x1 - x0) // SEGMENT_NOISE)] = 0  # specks do not bridge a gap
+        cols[cols <= max(1, (y1 - y0) // SEGMENT_NOISE)] = 0
+        ys, xs = np.flatnonzero(rows), np.flatnonzero(cols)
+        if not len(ys) or not len(xs) or ys[-1] - ys[0] < min_px or xs[-1] - xs[0] < min_px:
+            return []
+        rows, cols = rows[ys[0]:ys[-1] + 1], cols[xs[0]:xs[-1] + 1]
+        y0, y1, x0, x1 = y0 + int(ys[0]), y0 + int(ys[-1]) + 1, x0 + int(xs[0]), x0 + int(xs[-1]) + 1
+
+        # words of a headline are further apart than columns of body text: scale the column gap
+        # with the line height (capped, as rows of neighbouring columns can fill every line gap)
+        starts, ends = _runs(rows > 0)
+        line_px = int(np.median(ends - starts))
+        ycuts, ybest = _cuts(rows, h_rules[y0:y1, x0:x1].sum(axis=1) >= (x1 - x0) // 2, gap_y)
+        xcuts, xbest = _cuts(cols, v_rules[y0:y1, x0:x1].sum(axis=0) >= (y1 - y0) // 2,
+                             max(gap_x, min(line_px, 3 * gap_x)))
+        if not ycuts and not xcuts:
+            if text[y0:y1, x0:x1].mean() > MAX_BLOCK_INK:
+                return []
+            return [((x0, y0, x1, y1), True)]
+        out: List[Tuple[Block, bool]] = []
+        if ybest >= xbest:
+            bounds = [y0] + [y0 + c for c in ycuts] + [y1]
+            for a, b in zip(bounds, bounds[1:]):
+                for blk, single in cut(a, b, x0, x1):
+                    if single and out and out[-1][1]:  # same column: merge with the piece above
+                        above = out[-1][0]
+                        out[-1] = ((min(above[0], blk[0]), above[1], max(above[2], blk[2]), blk[3]), True)
+                    else:
+                        out.append((blk, single))
+        else:
+            bounds = [x0] + [x0 + c for c in xcuts] + [x1]
+            for a, b in zip(bounds, bounds[1:]):
+                out.extend((blk, False) for blk, _ in cut(y0, y1, a, b))
+        return out
+
+    return [blk for blk, _ in cut(0, img.shape[0], 0, img.shape[1])]
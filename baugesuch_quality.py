@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+import re
+import unicodedata
+from typing import FrozenSet, NamedTuple, Optional
+
+# ================================ Configuration ================================
+
+WORDS_PATH = os.environ.get("BAUGESUCH_WORDS_FILE") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "resources", "words.txt")
+
+# pages/regions scoring below this are OCR'd instead of parsed from their text layer
+QUALITY_THRESHOLD = float(os.environ.get("BAUGESUCH_OCR_QUALITY") or 0.45)
+
+DICT_RATIO_GOOD = 0.25   # share of known words at which prose counts as fully readable
+MOJIBAKE_BAD = 0.04      # share of garbled characters at which a text counts as unreadable
+SPARSE_WORDS = 20        # fewer words than this: no real text layer (scans often carry a stamp or page number)
+
+RE_WORD = re.compile(r"[^\W\d_]{2,}")
+# decoding debris: U+FFFD, C1 controls, private use area, UTF-8 read as Latin-1 ("Ã¼"), pdfminer "(cid:12)"
+RE_MOJIBAKE = re.compile(r"[\ufffd\x80-\x9f\ue000-\uf8ff]|[ÃÂ][\x80-\xbf]|\(cid:\d+\)")
+
+
+# ============================== Small utilities ==============================
+
+def _fold(s: str) -> str:
+    d = unicodedata.normalize("NFKD", s)
+    return "".join(ch for ch in d.lower() if not unicodedata.combining(ch))
+
+def load_words(path: str = "") -> FrozenSet[str]:
+    """
+    Word list (one word per line, # comments) in lower case, each also with umlauts folded
+    ("für" and "fur"), so lookups need no per-token folding. Empty if the default file is missing.
+    """
+    path = path or WORDS_PATH
+    if not os.path.isfile(path) and path == WORDS_PATH:
+        return frozenset()
+    with open(path, "r", encoding="utf-8") as f:
+        words = [w.strip().lower() for w in f if w.strip() and not w.startswith("#")]
+    return frozenset(words) | frozenset(_fold(w) for w in words)
+
+
+# ================================== Scorer ==================================
+
+class TextQuality(NamedTuple):
+    score: float        # 0 (garbage/empty) .. 1 (clean Baugesuch text)
+    labels: int         # distinct field labels found
+    header: bool
+    footer: bool
+    dict_ratio: float   # share of words found in the word list
+    mojibake: float     # share of garbled characters
+    words: int          # words (2+ letters) in the text
+
+    @property
+    def usable(self) -> bool:
+        return self.score >= QUALITY_THRESHOLD
+
+    @property
+    def needs_ocr(self) -> bool:
+        """
+        Page-level decision. A page with a header or footer is OCR'd when it is not `usable`; any
+        other page has no Baugesuch in its text layer, so it is OCR'd only when that layer is
+        missing or garbled, not for a low known-word share (ads, names, other languages).
+        """
+        if self.header or self.footer:
+            return not self.usable
+        return self.words < SPARSE_WORDS or self.mojibake >= MOJIBAKE_BAD
+
+class QualityScorer:
+    """
+    Cheap readability score of a text layer (or one box of it), from four signals: field
+    labels, Baugesuch header and footer, known-word ratio and mojibake rate. One regex pass
+    per signal, so scoring a page costs far less than parsing it.
+    Text that shows a header or footer is a Baugesuch page/box: structure (labels, header,
+    footer) and language count half each, so boxes whose labels did not survive score low.
+    Other text is judged on language alone. Mojibake scales the whole.
+    """
+
+    def __init__(self, label_re: "re.Pattern[str]", header_re: "re.Pattern[str]", footer_re: "re.Pattern[str]",
+                 words: Optional[FrozenSet[str]] = None, n_labels: int = 5):
+        self.label_re = label_re
+        self.header_re = header_re
+        self.footer_re = footer_re
+        self.words = words if words is not None else load_words()
+        self.n_labels = n_labels
+
+    def score(self, text: str) -> TextQuality:
+        if not text or not text.strip():
+            return TextQuality(0.0, 0, False, False, 0.0, 0.0, 0)
+        labels = len({m.group().lower() for m in self.label_re.finditer(text)})
+        header = self.header_re.search(text) is not None
+        footer = self.footer_re.search(text) is not None
+        tokens = RE_WORD.findall(text.lower())
+        known = sum(1 for t in tokens if t in self.words) if self.words else 0
+        dict_ratio = known / len(tokens) if tokens else 0.0
+        mojibake = len(RE_MOJIBAKE.findall(text)) / len(text)
+
+        language = min(1.0, dict_ratio / DICT_RATIO_GOOD) if self.words else 1.0
+        clean = max(0.0, 1.0 - mojibake / MOJIBAKE_BAD)
+        if header or footer:
+            structure = (min(labels, self.n_labels) / self.n_labels + header + footer) / 3
+            score = clean * (structure + language) / 2
+        else:
+            score = clean * language
+        return TextQuality(round(score, 4), labels, header, footer, round(dict_ratio, 4), round(mojibake, 4), len(tokens))
@@ -3,8 +3,27 @@ from __future__ import annotations
 import os
 import re
 import json
-import unicodedata
-from typing import List, Dict, Any
+import atexit
+import logging
+import importlib
+import importlib.util
+from contextlib import nullcontext
+from typing import List, Dict, Any, Callable, Iterable, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+import baugesuch_debug
+import baugesuch_lexicon
+import baugesuch_metrics
+import baugesuch_municipalities
+import baugesuch_preprocess
+import baugesuch_quality
+from baugesuch_cache import OcrCache, TextLayerCache
+from baugesuch_metrics import METRICS
+
+# Robot keywords: only these, not every public helper and import (robot.api.deco is not imported,
+# it would pull Robot into every OCR worker and benchmark)
+__all__ = ["parse_baugesuch_from_pdf", "get_baugesuch_metrics"]
+
+LOG = logging.getLogger("baugesuch")  # Robot Framework forwards it to its log
 
 # ======================= Constants & precompiled regex =======================
 
@@ -12,32 +31,89 @@ LABELS: List[str] = ["Bauherrschaft", "Bauvorhaben", "Lage", "Zone", "Zusatzgesu
 LABELS_UNION = "|".join(LABELS)
 
 HDR_RAW = r"(?:Baugesuch\s*spublikation|Baugesuchspublikation|Baugesuchspubli[kc]ation)"
-FTR_RAW = r"BAUVERWALTUNG\s+W[ÜU]RENLOS"
+# box footers ("BAUVERWALTUNG <GEMEINDE>") come from the municipality registry, see `_muni_regex`
 
-RE_BOX = re.compile(rf"{HDR_RAW}\b.*?{FTR_RAW}", re.S | re.I)
 RE_HEADER_LINE = re.compile(rf"^{HDR_RAW}\b\s*", re.I)
 RE_HEADER = re.compile(HDR_RAW, re.I)
-RE_FOOTER = re.compile(FTR_RAW, re.I)
 
-RE_LABELS_POS = re.compile(rf"(?P<label>{LABELS_UNION})\s*:?", re.I)
+# capital first letter: "Lage"/"Zone" inside "Siloanlage"/"Wohnzone" are not labels
+LABELS_CAPITAL = "|".join(f"{lab[0]}(?i:{lab[1:]})" for lab in LABELS)
+RE_LABELS_POS = re.compile(rf"(?P<label>{LABELS_CAPITAL})\s*:?")
 RE_LABEL_NAMES = re.compile(rf"^\s*(?:{LABELS_UNION})\s*:?", re.I)
 
 RE_GESUCHS = re.compile(r"Gesuchsauflage\s+vom", re.I)
 
-RE_SOFT_HYPH = re.compile("\u00ad")
-RE_HYPHEN_NL = re.compile(r"-\n")
-RE_SPACES = re.compile(r"[ \t]+")
-RE_ML_NL = re.compile(r"\n{2,}")
-RE_JOIN_LINES = re.compile(r"\s*\n\s*")
-RE_CAMEL_GAP = re.compile(r"(?<=[a-zäöüß])(?=[A-ZÄÖÜ])")
-RE_FOOTER_MULT = re.compile(rf"(?:{FTR_RAW})+", re.I)
-RE_MULTI_SPACE = re.compile(r"\s{2,}")
+SOFT_HYPHENS = "\u00ad\u0002\ufffe"  # soft hyphen + pdfium hyphen markers
+
+# single-scan normalization (see `_normalize`): one alternation per mode, only "dirty" spots match
+_SOFT = f"[{SOFT_HYPHENS}]"
+RE_NORM_FLAT = re.compile(r"\s{2,}|[\t\n]")
+RE_NORM_TEXT = re.compile(
+    rf"(?P<dehyph>-{_SOFT}*\n)|(?P<soft>{_SOFT}+)"
+    rf"|(?P<nl>[\r\n](?:{_SOFT}*[\r\n])+|\r)|(?P<ws>[ \t](?:{_SOFT}*[ \t])+|\t)")
+RE_NORM_FIELD = re.compile(
+    rf"(?P<dehyph>-{_SOFT}*\n)|(?P<soft>{_SOFT}+)|(?P<ws>\s(?:{_SOFT}*\s)+|[\t\n])"
+    r"|(?P<gap>(?<=[a-zäöüß])(?=[A-ZÄÖÜ]))")
+NORM_OTHERS_TAIL = rf"|(?P<dehyph>-{_SOFT}*\n)|(?P<soft>{_SOFT}+)|(?P<ws>\s(?:{_SOFT}*\s)+|[\t\n])"
 
-RE_WURENLOS = re.compile(r"\bw(?:ue)?r(?:en)?los\b", re.I)
-RE_PLZ_5436 = re.compile(r"\b5436\b")
+# label-split fallback: one scan finds every label word (distinct ones are counted)
+RE_SENTENCE_BREAK = re.compile(r"([.:;])\s+(?=[A-ZÄÖÜ])")
+RE_BAUHERRSCHAFT_WORD = re.compile(r"\bBauherrschaft\b")
+RE_LABEL_WORD = re.compile(rf"\b(?:{LABELS_UNION})\b")
+
+# per-entry fixes and the rescue pass
+RE_PARZELLE_WORD = re.compile(r"\bParzelle\b")
+RE_PARZELLE_START = re.compile(r"^\s*Parzelle\b", re.I)
+# rescue patterns: every repetition is bounded, so a miss costs linear time on any block
+RE_RESCUE_BH = re.compile(
+    r"(?:Bauherrschaft\s*:?\s*)?"
+    r"([A-ZÄÖÜ][\wÄÖÜäöüß\-. ]{1,80}?,\s*[A-Za-zÄÖÜäöüß\-]{1,40}(?:strasse|straße|str\.?)\s*\d+,\s*5436\s*W[üu]renlos)",
+    re.I)
+RE_RESCUE_BH_ANY = re.compile(
+    r"(?:Bauherrschaft\s*:?\s*)?"
+    r"([A-ZÄÖÜ][^,:\n]{1,80}?,\s*[^,:\n]{2,60}?\s\d+[a-z]?,\s*\d{4}\s*[A-ZÄÖÜ][\wäöüß\-]{1,30}(?:\s+[A-Z]{2}\b)?)")
+RE_RESCUE_BV = re.compile(
+    r"(Erweiterung\s*Silo[\w\-]*\s*anlage?\s*und\s*Umnutzung\s*Stall\s*\(teilweise\)\s*in\s*Milchkuh[\w\-]*boxen)"
+    r"(?=[\s\S]{0,400}?\bParzelle\b)",
+    re.I)
+RE_RESCUE_BV_LOOSE = re.compile(
+    r"(Erweiterung[\s\S]{0,300}?Milchkuh[\w\-]*boxen)(?=[\s\S]{0,400}?\bParzelle\b)", re.I)
+RE_RESCUE_BV_ANY = re.compile(
+    r"\b\d{4}\s*[A-ZÄÖÜ][\wäöüß\-]{1,30},?\s+(?:Bauvorhaben\s*:?\s*)?"
+    r"([A-ZÄÖÜ][^:]{4,250}?)\s*(?:Lage\s*:?\s*)?Parzellen?\b")
+RE_RESCUE_LAGE = re.compile(
+    r"(Parzelle\s*\d+\s*\(Plan\s*\d+\)\s*,\s*[A-Za-zÄÖÜäöüß\-]{1,40}(?:strasse|straße|str\.?)\s*\d+)", re.I)
+RE_RESCUE_LAGE_ANY = re.compile(
+    r"(Parzellen?\s*(?:Nr\.?\s*)?\d[\d/]*(?:\s*(?:,|und)\s*\d[\d/]*){0,5}(?:\s*\(Plan\s*\d+\))?"
+    r"\s*,\s*[^,:;\n]{2,60}?)(?=\s*(?:Zone|Zusatzgesuch|Gesuchsauflage)\b|\s*$)")
+RE_LANDSCHAFTSZONE = re.compile(r"Landschafts[\w\-]*zone", re.I)
+RE_RESCUE_ZONE_OUTSIDE = re.compile(r"Ausserhalb\s*Bauzone\s*[-–—:,]?\s*([A-ZÄÖÜ][\wäöüß\-]{2,40})")
+RE_RESCUE_ZONE_LABEL = re.compile(r"\bZone\s*:?\s*([A-ZÄÖÜ][^:\n]{2,60}?)(?=\s*(?:Zusatzgesuch|Gesuchsauflage)\b|\s*$)")
+RE_DEPARTEMENT_BVU = re.compile(r"Departement\s*Bau,\s*Verkehr\s*und\s*Umwelt", re.I)
 
 TESSERACT_EXE = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
+# Backend chains (see register_backend): the first engine whose modules import is used.
+TEXT_BACKEND = os.environ.get("BAUGESUCH_TEXT_BACKEND") or "pdfium,rpa,pypdf"
+OCR_ENGINE = os.environ.get("BAUGESUCH_OCR_ENGINE") or "tesserocr,tesseract-cli,pytesseract"
+
+# Parallel OCR: worker processes (0 = one per core) and per-page Tesseract timeout in seconds.
+OCR_WORKERS = int(os.environ.get("BAUGESUCH_OCR_WORKERS") or 0)
+OCR_PAGE_TIMEOUT = float(os.environ.get("BAUGESUCH_OCR_TIMEOUT") or 120)
+# "roi" = locate boxes at low res, OCR only those crops; "page" = OCR every column/box of the page.
+OCR_MODE = os.environ.get("BAUGESUCH_OCR_MODE") or "roi"
+# Render profile for OCR images (see RENDER_PROFILES): scale, color depth and pixel budget.
+RENDER_PROFILE = os.environ.get("BAUGESUCH_RENDER_PROFILE") or "ocr"
+# Text layers scoring below $BAUGESUCH_OCR_QUALITY (see baugesuch_quality) are OCR'd, per page or per box.
+
+# Page text per document (memory + disk under $BAUGESUCH_CACHE_DIR, default .cache/baugesuch).
+TEXT_CACHE = TextLayerCache()
+atexit.register(TEXT_CACHE.flush)
+# OCR text per (image digest, engine, lang, oem, psm), LRU-bounded by $BAUGESUCH_OCR_CACHE_MB (0 disables).
+OCR_CACHE = OcrCache()
+atexit.register(OCR_CACHE.flush)
+OCR_OEM = 3
+
 
 # ============================== Small utilities ==============================
 
@@ -59,132 +135,1061 @@ def _as_text(x: Any) -> str:
     return str(x or "")
 
 def _collapse_text(s: str) -> str:
-    if not s:
-        return ""
-    s = RE_SOFT_HYPH.sub("", s)
-    s = RE_HYPHEN_NL.sub("", s)
-    s = s.replace("\r", "\n")
-    s = RE_SPACES.sub(" ", s)
-    s = RE_ML_NL.sub("\n\n", s)
-    return s.strip()
+    """Page/box text: drop soft hyphens, dehyphenate, collapse blanks and blank lines (keeps lines)."""
+    return _normalize(s, "text") if s else ""
 
 def _clean_spaces(s: str) -> str:
-    s = RE_JOIN_LINES.sub(" ", s)
-    s = RE_SPACES.sub(" ", s)
-    s = RE_MULTI_SPACE.sub(" ", s)
-    return s.strip()
+    """Single-line value: every newline/tab and whitespace run becomes one space. No-op on `_Clean` values."""
+    if isinstance(s, _Clean):
+        return s
+    return _Clean(RE_NORM_FLAT.sub(" ", s).strip())
 
-def _asciify_lower(s: str) -> str:
-    d = unicodedata.normalize("NFKD", s or "")
-    return "".join(ch for ch in d.lower() if not unicodedata.combining(ch))
+Municipality = baugesuch_municipalities.Municipality
 
-def _looks_like_wurenlos(t: str) -> bool:
-    return bool(RE_WURENLOS.search(t) or RE_PLZ_5436.search(t))
+def _municipalities() -> baugesuch_municipalities.MunicipalityRegistry:
+    return baugesuch_municipalities.get_registry()
 
+def _select_gemeinden(spec: str = "") -> List[Municipality]:
+    """Registered Gemeinden named in `spec` ("Würenlos,Killwangen", "all"; default $BAUGESUCH_GEMEINDEN)."""
+    return _municipalities().select(spec)
 
-# ============================== OCR / Rendering ==============================
 
-def _render_pdf_page_to_png(pdf_path: str, page1: int, out_png_path: str, scale: float = 3.0) -> str:
-    import pypdfium2 as pdfium
-    idx = page1 - 1
-    pdf = pdfium.PdfDocument(pdf_path)
-    if not (0 <= idx < len(pdf)):
-        raise IndexError(f"Page {page1} out of range (pdf has {len(pdf)} pages)")
-    p = pdf.get_page(idx)
+# ============================== Normalization ==============================
+
+_LOWER = frozenset("abcdefghijklmnopqrstuvwxyzäöüß")
+_UPPER = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÜ")
+
+class _Clean(str):
+    """
+    A value already normalized to a single line. str methods return plain str,
+    so any later edit (replace, slicing, concatenation) drops the mark automatically.
+    """
+    __slots__ = ()
+
+def _dehyph_repl(m: "re.Match[str]") -> str:
+    kind = m.lastgroup
+    if kind == "ws":
+        return " "
+    if kind == "nl":
+        return "\n\n" if len(m.group()) > 1 else "\n"
+    return ""  # dehyph, soft
+
+def _field_repl(m: "re.Match[str]") -> str:
+    kind = m.lastgroup
+    if kind == "ws" or kind == "gap":
+        return " "
+    if kind == "footer":
+        return _municipalities().canonical_footer(m.group())
+    # dehyph/soft removal can glue "aB": keep the camel-case gap a separate pass would have added
+    s, i, j = m.string, m.start(), m.end()
+    if m.re is RE_NORM_FIELD and 0 < i and j < len(s) and s[i - 1] in _LOWER and s[j] in _UPPER:
+        return " "
+    return ""
+
+def _normalize(s: str, mode: str) -> str:
+    """
+    One regex scan per value instead of a chain of re.sub passes. Modes:
+      "text"   soft hyphens, "-\n" dehyphenation, \r, blank runs and blank lines (lines kept);
+      "field"  the same on one line, plus a space at glued camel-case gaps, trimmed of " ·;:,";
+      "others" like "field" without the gap, with repeated footers folded into one.
+    "field"/"others" results are `_Clean`, so `_clean_spaces` skips them later.
+    """
+    if mode == "text":
+        return RE_NORM_TEXT.sub(_dehyph_repl, s).strip()
+    if isinstance(s, _Clean):
+        return s
+    if mode == "field":
+        return _Clean(RE_NORM_FIELD.sub(_field_repl, s).strip(" ·;:,").strip())
+    return _Clean(_muni_regex().norm_others.sub(_field_repl, s).strip())
+
+
+# ============================ Municipality matchers ============================
+
+class _MuniRegex(NamedTuple):
+    matchers: baugesuch_municipalities.Matchers  # what these were built from
+    box: "re.Pattern[str]"                       # header .. first footer of any Gemeinde (group f<i> says which)
+    footer: "re.Pattern[str]"
+    norm_others: "re.Pattern[str]"               # RE_NORM_FIELD for "others", with repeated footers folded
+
+_MUNI_REGEX: Optional[_MuniRegex] = None
+
+def _muni_regex() -> _MuniRegex:
+    """Reader patterns composed from the registry's combined footer alternation (rebuilt if it changes)."""
+    global _MUNI_REGEX
+    mt = _municipalities().matchers
+    if _MUNI_REGEX is None or _MUNI_REGEX.matchers is not mt:
+        _MUNI_REGEX = _MuniRegex(
+            matchers=mt,
+            box=re.compile(rf"{HDR_RAW}\b.*?{mt.footer_named}", re.S | re.I),
+            footer=mt.footer,
+            norm_others=re.compile(rf"(?P<footer>{mt.footer_any}+){NORM_OTHERS_TAIL}", re.I),
+        )
+    return _MUNI_REGEX
+
+
+# ============================== Backend registry ==============================
+
+class Backend(NamedTuple):
+    kind: str                   # "text" | "ocr"
+    name: str
+    requires: Tuple[str, ...]   # modules imported only when this backend is selected
+    fn: Callable[..., Any]
+
+_BACKENDS: Dict[Tuple[str, str], Backend] = {}
+_RESOLVED: Dict[Tuple[str, str], Backend] = {}
+
+def register_backend(kind: str, name: str, requires: Tuple[str, ...] = ()) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator: make `fn` selectable as backend `name` of `kind`; nothing is imported here."""
+    def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
+        _BACKENDS[(kind, name)] = Backend(kind, name, tuple(requires), fn)
+        _RESOLVED.clear()
+        return fn
+    return deco
+
+def backend_names(kind: str) -> List[str]:
+    return [name for (k, name) in _BACKENDS if k == kind]
+
+def backend_available(kind: str, name: str) -> bool:
+    """True if the backend exists and its modules can be found (checked without importing them)."""
+    b = _BACKENDS.get((kind, name))
+    if b is None:
+        return False
     try:
-        bmp = p.render(scale=scale)  
-        img = bmp.to_pil()
-        img.save(out_png_path)
-        return out_png_path
-    finally:
-        p.close()
+        return all(importlib.util.find_spec(m) is not None for m in b.requires)
+    except (ImportError, ValueError):
+        return False
+
+def resolve_backend(kind: str, chain: str) -> Backend:
+    """
+    Pick the first backend of a comma-separated `chain` whose modules import, importing only
+    that backend's modules. The choice is made once per (kind, chain) and then reused, so the
+    set of loaded engines is deterministic for a given configuration.
+    """
+    key = (kind, chain)
+    if key in _RESOLVED:
+        return _RESOLVED[key]
+    for name in (n.strip() for n in chain.split(",")):
+        if not backend_available(kind, name):
+            continue
+        b = _BACKENDS[(kind, name)]
+        try:
+            for m in b.requires:
+                importlib.import_module(m)
+        except Exception:
+            continue
+        _RESOLVED[key] = b
+        return b
+    raise RuntimeError(f"No usable {kind} backend in {chain!r} (known: {', '.join(backend_names(kind))})")
+
+
+# ============================== Document session ==============================
+
+class PdfSession:
+    """
+    One open PDF shared by every stage of a parse. The pypdfium2 document (and a pypdf
+    reader, only if the text fallback needs one) are opened lazily, once, and closed together.
+    """
+
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self._pdfium: Any = None
+        self._pypdf: Any = None
+        self._pypdf_file: Any = None
+        self._pages: Dict[int, Any] = {}
+        self._methods: Dict[int, str] = {}
+
+    def __enter__(self) -> "PdfSession":
+        return self
 
-def _ocr_image_to_text(image_path: str, lang: str = "deu+eng") -> str:
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def pdfium(self) -> Any:
+        if self._pdfium is None:
+            import pypdfium2 as pdfium
+            self._pdfium = pdfium.PdfDocument(self.pdf_path)
+        return self._pdfium
+
+    @property
+    def pypdf(self) -> Any:
+        if self._pypdf is None:
+            from pypdf import PdfReader
+            self._pypdf_file = open(self.pdf_path, "rb")
+            self._pypdf = PdfReader(self._pypdf_file)
+        return self._pypdf
+
+    def page_count(self) -> int:
+        try:
+            return len(self.pdfium)
+        except Exception:
+            pass
+        try:
+            return len(self.pypdf.pages)
+        except Exception:
+            return 0
+
+    def page(self, page1: int) -> Any:
+        """Open pypdfium2 page (1-based), kept until `release` or `close`."""
+        p = self._pages.get(page1)
+        if p is None:
+            idx = page1 - 1
+            if not (0 <= idx < len(self.pdfium)):
+                raise IndexError(f"Page {page1} out of range (pdf has {len(self.pdfium)} pages)")
+            p = self._pages[page1] = self.pdfium.get_page(idx)
+        return p
+
+    def page_size(self, page1: int) -> Tuple[float, float]:
+        return self.page(page1).get_size()
+
+    def text(self, page1: int) -> str:
+        return _read_text_layer(self.pdf_path, page1, session=self)
+
+    def method(self, page1: int) -> str:
+        """"ocr" if the page's text layer is missing or too poor to parse, else "text" (scored once per page)."""
+        m = self._methods.get(page1)
+        if m is None:
+            m = self._methods[page1] = "ocr" if _text_quality(self.text(page1)).needs_ocr else "text"
+        return m
+
+    def set_method(self, page1: int, method: str) -> None:
+        self._methods[page1] = method
+
+    def render_pnm(self, page1: int, scale: float, crop: Tuple[float, float, float, float] = (0, 0, 0, 0),
+                   grayscale: bool = False, threshold: int = 0, preprocess: str = "") -> bytes:
+        return _render_page_to_pnm(self.page(page1), scale, crop=crop, grayscale=grayscale, threshold=threshold,
+                                   preprocess=preprocess)
+
+    def release(self, page1: int) -> None:
+        p = self._pages.pop(page1, None)
+        if p is not None:
+            p.close()
+
+    def close(self) -> None:
+        TEXT_CACHE.flush(self.pdf_path)  # pages extracted in this session, one write per document
+        for p in self._pages.values():
+            p.close()
+        self._pages.clear()
+        if self._pdfium is not None:
+            self._pdfium.close()
+            self._pdfium = None
+        if self._pypdf_file is not None:
+            self._pypdf_file.close()
+            self._pypdf_file = self._pypdf = None
+
+_WORKER_SESSIONS: Dict[Tuple[str, int, int, int], PdfSession] = {}
+
+def _worker_session(pdf_path: str) -> PdfSession:
+    """
+    Per-process session for OCR jobs: a worker keeps its current document open across pages.
+    Keyed by pid too, so a forked worker never reuses a handle inherited from its parent.
+    """
+    st = os.stat(pdf_path)
+    key = (os.path.abspath(pdf_path), st.st_size, st.st_mtime_ns, os.getpid())
+    session = _WORKER_SESSIONS.get(key)
+    if session is None:
+        for old in _WORKER_SESSIONS.values():
+            try:
+                old.close()
+            except Exception:
+                pass
+        _WORKER_SESSIONS.clear()
+        session = _WORKER_SESSIONS[key] = PdfSession(pdf_path)
+    return session
+
+
+# ============================== OCR / Rendering ==============================
+
+def _bitmap_to_pnm(bmp: Any) -> bytes:
+    """Wrap a pypdfium2 bitmap buffer in a PNM header (P5 gray / P6 RGB); strips row padding only."""
+    w, h, n = bmp.width, bmp.height, bmp.n_channels
+    if n not in (1, 3) or (n == 3 and not bmp.rev_byteorder):
+        return _bitmap_to_pnm_via_pil(bmp)
+    buf = memoryview(bmp.buffer).cast("B")
+    row = w * n
+    if bmp.stride == row:
+        pixels = bytes(buf[:row * h])
+    else:
+        pixels = b"".join(buf[y * bmp.stride:y * bmp.stride + row] for y in range(h))
+    return b"P%d\n%d %d\n255\n" % (5 if n == 1 else 6, w, h) + pixels
+
+def _bitmap_to_pnm_via_pil(bmp: Any) -> bytes:
+    img = bmp.to_pil().convert("RGB")
+    return b"P6\n%d %d\n255\n" % img.size + img.tobytes()
+
+def _binarize_pnm(pnm: bytes, threshold: int) -> bytes:
+    """Gray PNM to pure black/white at `threshold`: one C-level byte translation, no per-pixel Python."""
+    head, sep, pixels = pnm.partition(b"\n255\n")
+    return head + sep + pixels.translate(_binary_table(threshold))
+
+_BINARY_TABLES: Dict[int, bytes] = {}
+
+def _binary_table(threshold: int) -> bytes:
+    table = _BINARY_TABLES.get(threshold)
+    if table is None:
+        table = _BINARY_TABLES[threshold] = bytes(0 if i < threshold else 255 for i in range(256))
+    return table
+
+def _render_page_to_pnm(p: Any, scale: float, crop: Tuple[float, float, float, float] = (0, 0, 0, 0),
+                        grayscale: bool = False, threshold: int = 0, preprocess: str = "") -> bytes:
+    """
+    Render an open pypdfium2 page (optionally cropped, in PDF points per side) to PNM bytes:
+    RGB (P6), or 8-bit gray (P5, a third of the pixels' bytes) with `grayscale`, binarized at
+    `threshold` (1..255) if given. Gray renders run the `preprocess` steps (baugesuch_preprocess)
+    on the bitmap buffer itself when NumPy is available; a binarizing step replaces `threshold`.
+    """
+    gray = grayscale or threshold > 0
+    with METRICS.span("render"):
+        bmp = p.render(scale=scale, crop=crop, rev_byteorder=True, grayscale=gray)
+        METRICS.incr("rendered_pixels", bmp.width * bmp.height)
+        if not (preprocess and gray and baugesuch_preprocess.available()):
+            pnm = _bitmap_to_pnm(bmp)
+            return _binarize_pnm(pnm, threshold) if threshold > 0 and pnm.startswith(b"P5") else pnm
+    with METRICS.span("preprocess"):
+        img = baugesuch_preprocess.run(baugesuch_preprocess.bitmap_array(bmp), preprocess, scale)
+        pnm = b"P5\n%d %d\n255\n" % (img.shape[1], img.shape[0]) + img.tobytes()
+    if threshold > 0 and not baugesuch_preprocess.binarizes(preprocess):
+        pnm = _binarize_pnm(pnm, threshold)
+    return pnm
+
+# ================================ Render profiles ================================
+
+class RenderProfile(NamedTuple):
+    name: str
+    text_px: float      # target median word height in pixels; the scale follows from the page's text size
+    min_scale: float
+    max_scale: float
+    max_pixels: int     # per rendered image, bounds the memory of every OCR worker
+    grayscale: bool
+    threshold: int      # > 0: binarize at this gray level (when no preprocessing step binarizes)
+    preprocess: str = ""  # baugesuch_preprocess steps for gray renders, e.g. "deskew,rules,despeckle"
+
+RENDER_PROFILES: Dict[str, RenderProfile] = {
+    # 22 px words: about the old fixed scale 3.0 on Limmatwelle body text, in gray (a third of the bytes)
+    "ocr":     RenderProfile("ocr", 22.0, 1.5, 4.0, 24_000_000, True, 0, "deskew,rules,despeckle"),
+    "binary":  RenderProfile("binary", 22.0, 1.5, 4.0, 24_000_000, True, 170, "sauvola,deskew,rules,despeckle"),
+    "fast":    RenderProfile("fast", 14.0, 1.0, 2.5, 8_000_000, True, 0),
+    "quality": RenderProfile("quality", 32.0, 2.0, 6.0, 60_000_000, False, 0),
+}
+
+DEFAULT_TEXT_PT = 7.0  # median word height of Limmatwelle body text (9 pt type), when the page gives no estimate
+
+def register_render_profile(profile: RenderProfile) -> None:
+    """Add or replace a render profile (select it with BAUGESUCH_RENDER_PROFILE)."""
+    RENDER_PROFILES[profile.name] = profile
+
+def _render_profile(name: str = "") -> RenderProfile:
+    name = name or RENDER_PROFILE
+    prof = RENDER_PROFILES.get(name)
+    if prof is None:
+        raise ValueError(f"Unknown render profile {name!r}; known: {', '.join(RENDER_PROFILES)}")
+    return prof
+
+def _auto_scale(width_pt: float, height_pt: float, text_pt: float = 0.0,
+                profile: Optional[RenderProfile] = None) -> float:
+    """
+    Scale that renders words `text_pt` high at the profile's word height, clamped to its scale range
+    and to its pixel budget for a width_pt x height_pt area. Rounded, so the same page renders
+    to the same bytes (and OCR cache key) every run.
+    """
+    prof = profile or _render_profile()
+    scale = min(max(prof.text_px / (text_pt or DEFAULT_TEXT_PT), prof.min_scale), prof.max_scale)
+    budget = (prof.max_pixels / max(1.0, width_pt * height_pt)) ** 0.5
+    return round(min(scale, budget), 2)
+
+def _estimate_text_pt(words: List[Dict[str, Any]], scale: float = 1.0) -> float:
+    """Median height in PDF points of OCR/text-layer words (rendered at `scale`); 0 if there are too few."""
+    heights = sorted(w["y1"] - w["y0"] for w in words if w["y1"] > w["y0"] and len(w["text"]) > 2)
+    if len(heights) < 5:
+        return 0.0
+    return heights[len(heights) // 2] / scale
+
+def _render_for_ocr(session: PdfSession, page1: int, scale: float = 0.0, region: Optional[Region] = None,
+                    text_pt: float = 0.0) -> bytes:
+    """Render a page (or a top-left-origin `region` of it) per the render profile; `scale` 0 = automatic."""
+    prof = _render_profile()
+    page_w, page_h = session.page_size(page1)
+    if region is None:
+        crop, w, h = (0.0, 0.0, 0.0, 0.0), page_w, page_h
+    else:
+        crop, w, h = _region_crop(region, page_w, page_h), region[2] - region[0], region[3] - region[1]
+    scale = scale or _auto_scale(w, h, text_pt, prof)
+    steps = prof.preprocess if baugesuch_preprocess.PREPROCESS is None else baugesuch_preprocess.PREPROCESS
+    return session.render_pnm(page1, scale, crop=crop, grayscale=prof.grayscale, threshold=prof.threshold,
+                              preprocess=steps)
+
+def _tesseract_cmd() -> str:
+    return TESSERACT_EXE if TESSERACT_EXE and os.path.isfile(TESSERACT_EXE) else "tesseract"
+
+@register_backend("ocr", "tesseract-cli", requires=("subprocess",))
+def _ocr_engine_cli(pnm: bytes, lang: str, timeout: float, psm: int, *extra: str) -> str:
+    """Pipe an in-memory PNM image to `tesseract stdin stdout`."""
+    import subprocess
+    proc = subprocess.run(
+        [_tesseract_cmd(), "stdin", "stdout", "-l", lang, "--oem", str(OCR_OEM), "--psm", str(psm), *extra],
+        input=pnm, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout or None,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"tesseract failed ({proc.returncode}): {proc.stderr.decode('utf-8', 'replace').strip()}")
+    return proc.stdout.decode("utf-8", "replace")
+
+@register_backend("ocr", "pytesseract", requires=("pytesseract", "PIL.Image"))
+def _ocr_engine_pytesseract(pnm: bytes, lang: str, timeout: float, psm: int, *extra: str) -> str:
+    import io
     import pytesseract
     from PIL import Image
-    if TESSERACT_EXE and os.path.isfile(TESSERACT_EXE):
-        pytesseract.pytesseract.tesseract_cmd = TESSERACT_EXE
-    return pytesseract.image_to_string(Image.open(image_path), lang=lang, config="--oem 3 --psm 6")
+    pytesseract.pytesseract.tesseract_cmd = _tesseract_cmd()
+    img = Image.open(io.BytesIO(pnm))
+    config = f"--oem {OCR_OEM} --psm {psm}"
+    if "tsv" in extra:
+        return pytesseract.image_to_data(img, lang=lang, config=config, timeout=timeout)
+    return pytesseract.image_to_string(img, lang=lang, config=config, timeout=timeout)
+
+TSV_HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+
+def _pnm_pixels(pnm: bytes) -> Tuple[int, int, int, bytes]:
+    """(width, height, channels, raw pixels) of a binary P5/P6 PNM as written by `_bitmap_to_pnm`."""
+    magic, dims, _maxval, pixels = pnm.split(b"\n", 3)
+    w, h = (int(v) for v in dims.split())
+    return w, h, 1 if magic == b"P5" else 3, pixels
+
+_TESS_APIS: Dict[Tuple[str, int], Any] = {}
+
+def _tess_api(lang: str) -> Any:
+    """
+    Resident tesserocr API per lang and process: the traineddata is loaded once and reused for
+    every image, whatever its PSM (set per call). Keyed by pid, so a forked worker never
+    shares its parent's handle.
+    """
+    key = (lang, os.getpid())
+    api = _TESS_APIS.get(key)
+    if api is None:
+        import tesserocr
+        kwargs: Dict[str, Any] = {"lang": lang, "oem": OCR_OEM}
+        tessdata = os.path.join(os.path.dirname(TESSERACT_EXE), "tessdata")
+        if os.path.isdir(tessdata):
+            kwargs["path"] = tessdata
+        api = _TESS_APIS[key] = tesserocr.PyTessBaseAPI(**kwargs)
+        METRICS.incr("tesseract_model_loads")
+    return api
+
+@register_backend("ocr", "tesserocr", requires=("tesserocr",))
+def _ocr_engine_tesserocr(pnm: bytes, lang: str, timeout: float, psm: int, *extra: str) -> str:
+    """
+    Tesseract C API in-process: no subprocess, temp file or model reload per image.
+    There is no per-call timeout; the OCR pool's per-page timeout still applies.
+    """
+    w, h, n, pixels = _pnm_pixels(pnm)
+    api = _tess_api(lang)
+    try:
+        api.SetPageSegMode(psm)
+        api.SetImageBytes(pixels, w, h, n, w * n)
+        if "tsv" in extra:
+            return TSV_HEADER + api.GetTSVText(0)
+        return api.GetUTF8Text()
+    finally:
+        api.Clear()
+
+def _run_tesseract(pnm: bytes, lang: str, timeout: float, psm: int = 6, *extra: str) -> str:
+    """OCR an in-memory PNM image with the selected OCR_ENGINE (via OCR_CACHE)."""
+    backend = resolve_backend("ocr", OCR_ENGINE)
+    key = OCR_CACHE.make_key(pnm, backend.name, lang, OCR_OEM, psm, *extra)
+    cached = OCR_CACHE.get(key)
+    if cached is not None:
+        METRICS.incr("ocr_cache_hits")
+        return cached
+    METRICS.incr("ocr_cache_misses")
+    with METRICS.span("tesseract"):
+        text = backend.fn(pnm, lang, timeout, psm, *extra)
+    OCR_CACHE.put(key, text)
+    return text
+
+def _ocr_pnm_to_text(pnm: bytes, lang: str = "deu+eng", timeout: float = 0) -> str:
+    return _run_tesseract(pnm, lang, timeout)
+
+def _ocr_pnm_to_words(pnm: bytes, lang: str = "deu+eng", timeout: float = 0) -> List[Dict[str, Any]]:
+    """Sparse-text OCR (psm 11) returning words with pixel boxes and a (block, par, line) key."""
+    words: List[Dict[str, Any]] = []
+    for row in _run_tesseract(pnm, lang, timeout, 11, "tsv").splitlines()[1:]:
+        cols = row.split("\t")
+        if len(cols) < 12 or not cols[11].strip():
+            continue
+        left, top, width, height = (int(c) for c in cols[6:10])
+        words.append({
+            "text": cols[11].strip(), "line": (cols[2], cols[3], cols[4]),
+            "x0": left, "y0": top, "x1": left + width, "y1": top + height,
+        })
+    return words
+
+
+# ============================ Region-of-interest OCR ============================
+
+# Cheap locate pass scale, and padding (PDF points) around each located box.
+ROI_LOCATE_SCALE = 1.5
+ROI_PAD = 6.0
+
+RE_ROI_HEADER_WORD = re.compile(r"^Baugesuch\w*publi", re.I)
+
+Region = Tuple[float, float, float, float]  # (x0, y0, x1, y1) in PDF points, top-left origin
+
+def _locate_box_regions(words: List[Dict[str, Any]], page_w: float, page_h: float, scale: float) -> List[Region]:
+    """
+    Pair each header word with the nearest footer below it whose left edge is aligned, and
+    return the enclosing regions, widened to the words that start inside them.
+    Orphan footers get a region reaching a third of the page upwards.
+    """
+    pts = [dict(w, x0=w["x0"] / scale, y0=w["y0"] / scale, x1=w["x1"] / scale, y1=w["y1"] / scale)
+           for w in words]
+    headers = [w for w in pts if RE_ROI_HEADER_WORD.search(w["text"])]
+    mt = _municipalities().matchers
+    footers: List[Dict[str, Any]] = []
+    for i, w in enumerate(pts):
+        if mt.footer_word.search(w["text"]):
+            f = dict(w)
+            nxt = pts[i + 1] if i + 1 < len(pts) else None
+            if nxt and nxt["line"] == w["line"] and mt.footer_tail.search(nxt["text"]):
+                f["x1"], f["y1"] = max(f["x1"], nxt["x1"]), max(f["y1"], nxt["y1"])
+            footers.append(f)
+
+    tol = 0.1 * page_w
+    used: set = set()
+    spans: List[List[float]] = []
+    for h in headers:
+        below = [(j, f) for j, f in enumerate(footers)
+                 if j not in used and f["y0"] > h["y1"] and abs(f["x0"] - h["x0"]) <= tol]
+        if below:
+            j, f = min(below, key=lambda jf: jf[1]["y0"])
+            used.add(j)
+            spans.append([min(h["x0"], f["x0"]), h["y0"], max(h["x1"], f["x1"]), f["y1"]])
+        else:
+            spans.append([h["x0"], h["y0"], h["x1"], page_h])
+    for j, f in enumerate(footers):
+        if j not in used:
+            spans.append([f["x0"], max(0.0, f["y0"] - page_h / 3), f["x1"], f["y1"]])
+
+    regions: List[Region] = []
+    for x0, y0, x1, y1 in spans:
+        # never grow into a neighbouring box to the right
+        limit = min([o[0] for o in spans if o[0] > x0 + tol and o[1] < y1 and o[3] > y0] + [page_w])
+        x1 = min(x1, limit)
+        for w in pts:
+            if x0 - ROI_PAD <= w["x0"] <= x1 and y0 <= w["y0"] and w["y1"] <= y1:
+                x1 = max(x1, min(w["x1"], limit))
+        regions.append((max(0.0, x0 - ROI_PAD), max(0.0, y0 - ROI_PAD),
+                        min(limit, x1 + ROI_PAD), min(page_h, y1 + ROI_PAD)))
+    regions.sort(key=lambda r: (r[0], r[1]))
+    return regions
+
+def _region_crop(region: Region, page_w: float, page_h: float) -> Tuple[float, float, float, float]:
+    """pypdfium2 crop (left, bottom, right, top margins) for a top-left-origin region."""
+    x0, y0, x1, y1 = region
+    return x0, page_h - y1, page_w - x1, y0
+
+# ============================== Layout segmentation ==============================
+
+# Page OCR is split into the columns/boxes found by layout segmentation (baugesuch_preprocess,
+# needs numpy), each OCR'd on its own, so side-by-side boxes are not read line by line across.
+OCR_SEGMENT = (os.environ.get("BAUGESUCH_OCR_SEGMENT") or "1") != "0"
+SEGMENT_SCALE = 2.0   # gray render for the projection profiles (~130 ms per Limmatwelle page, render included)
+SEGMENT_PAD = 2.0     # PDF points added around each block
+BLOCK_PSM = 4         # a column of text of variable sizes (headline, lead, body)
+BOX_PSM = 6           # one uniform block of text: a located Baugesuch box
+
+class OcrBlock(NamedTuple):
+    page1: int
+    region: Optional[Region]   # None = the whole page
+    text_pt: float             # median word height in points, 0 = unknown
+    psm: int
+
+def _segment_page(session: PdfSession, page1: int) -> List[Region]:
+    """Columns and boxes of a page in reading order; [] if segmentation is off or numpy is missing."""
+    if not (OCR_SEGMENT and baugesuch_preprocess.available()):
+        return []
+    page_w, page_h = session.page_size(page1)
+    with METRICS.span("segment"):
+        img = baugesuch_preprocess.pnm_array(session.render_pnm(page1, SEGMENT_SCALE, grayscale=True))
+        blocks = baugesuch_preprocess.segment_blocks(img, SEGMENT_SCALE)
+    return [(max(0.0, x0 / SEGMENT_SCALE - SEGMENT_PAD), max(0.0, y0 / SEGMENT_SCALE - SEGMENT_PAD),
+             min(page_w, x1 / SEGMENT_SCALE + SEGMENT_PAD), min(page_h, y1 / SEGMENT_SCALE + SEGMENT_PAD))
+            for x0, y0, x1, y1 in blocks]
+
+def _region_text_pt(words: List[Dict[str, Any]], region: Region) -> float:
+    """Text size of the locate-pass words starting inside `region`, else of the whole page."""
+    inside = [w for w in words if region[0] <= w["x0"] / ROI_LOCATE_SCALE < region[2]
+              and region[1] <= w["y0"] / ROI_LOCATE_SCALE < region[3]]
+    return _estimate_text_pt(inside, ROI_LOCATE_SCALE) or _estimate_text_pt(words, ROI_LOCATE_SCALE)
+
+def _plan_page_blocks(session: PdfSession, page1: int, lang: str, timeout: float, mode: str,
+                      roi_fallback: bool = True) -> List[OcrBlock]:
+    """
+    What to OCR on a page. "roi" mode: a low-res sparse pass finds header/footer words and each
+    located box is one block. Otherwise the page's columns and boxes from layout segmentation,
+    or the whole page when segmentation is off. If "roi" finds no box, the page falls back to
+    that only with `roi_fallback` (a page the caller asked for); scan candidates get no blocks.
+    """
+    words: List[Dict[str, Any]] = []
+    if mode == "roi":
+        page_w, page_h = session.page_size(page1)
+        with METRICS.span("roi_locate"):
+            words = _ocr_pnm_to_words(session.render_pnm(page1, ROI_LOCATE_SCALE, grayscale=True), lang, timeout)
+            regions = _locate_box_regions(words, page_w, page_h, ROI_LOCATE_SCALE)
+        METRICS.incr("roi_regions", len(regions))
+        if regions:
+            return [OcrBlock(page1, r, _region_text_pt(words, r), BOX_PSM) for r in regions]
+        if not roi_fallback:
+            METRICS.incr("roi_empty_pages")
+            return []
+        METRICS.incr("roi_full_page_fallbacks")
+    columns = _segment_page(session, page1)
+    METRICS.incr("segment_blocks", len(columns))
+    if not columns:
+        return [OcrBlock(page1, None, _estimate_text_pt(words, ROI_LOCATE_SCALE), BOX_PSM)]
+    return [OcrBlock(page1, c, _region_text_pt(words, c), BLOCK_PSM) for c in columns]
+
+def _ocr_block(session: PdfSession, block: OcrBlock, scale: float, lang: str, timeout: float) -> str:
+    """Render one block per the render profile (`scale` 0 = automatic) and OCR it with its PSM."""
+    pnm = _render_for_ocr(session, block.page1, scale, block.region, block.text_pt)
+    return _run_tesseract(pnm, lang, timeout, block.psm)
+
+
+# ================================ Parallel OCR ================================
+
+def _ocr_error(page1: int, stage: str, exc: BaseException) -> None:
+    """Log and count an OCR job that raised or timed out, so a broken engine is not silent."""
+    LOG.warning("OCR of page %d failed (%s): %s: %s", page1, stage, type(exc).__name__, exc)
+    METRICS.incr("ocr_errors")
+
+def _ocr_page_job(pdf_path: str, page1: int, scale: float, lang: str, timeout: float, mode: str = "roi",
+                  session: Optional[PdfSession] = None, roi_fallback: bool = True) -> Optional[str]:
+    """
+    Plan and OCR one page block by block, in memory (in-process path). A failed block leaves
+    a gap; None if planning failed or every block did.
+    """
+    session = session or _worker_session(pdf_path)
+    try:
+        try:
+            blocks = _plan_page_blocks(session, page1, lang, timeout, mode, roi_fallback)
+        except Exception as exc:
+            _ocr_error(page1, "plan", exc)
+            return None
+        parts: List[Optional[str]] = []
+        for b in blocks:
+            try:
+                parts.append(_ocr_block(session, b, scale, lang, timeout))
+            except Exception as exc:
+                _ocr_error(page1, "block", exc)
+                parts.append(None)
+        return _join_blocks(parts)
+    finally:
+        session.release(page1)
+
+def _join_blocks(parts: List[Optional[str]]) -> Optional[str]:
+    """Page text from its block texts (None = the block failed); None if there were blocks and all failed."""
+    METRICS.incr("ocr_failed_blocks", parts.count(None))
+    if parts and all(t is None for t in parts):
+        return None
+    return "\n\n".join(t for t in parts if t)
+
+def _plan_page_job(pdf_path: str, page1: int, lang: str, timeout: float, mode: str,
+                   roi_fallback: bool = True) -> List[OcrBlock]:
+    """Worker job: the blocks of one page (top-level, so it pickles)."""
+    session = _worker_session(pdf_path)
+    try:
+        return _plan_page_blocks(session, page1, lang, timeout, mode, roi_fallback)
+    finally:
+        session.release(page1)
+
+def _ocr_block_job(pdf_path: str, block: OcrBlock, scale: float, lang: str, timeout: float) -> str:
+    """Worker job: OCR one block with the worker's own `_worker_session`."""
+    session = _worker_session(pdf_path)
+    try:
+        return _ocr_block(session, block, scale, lang, timeout)
+    finally:
+        session.release(block.page1)
+
+def _ocr_worker_init(engine_chain: str, lang: str) -> None:
+    """Pool initializer: import the OCR engine once per worker and, if it can stay resident, load its models."""
+    METRICS.reset()  # a forked worker starts with a copy of the parent's numbers
+    try:
+        if resolve_backend("ocr", engine_chain).name == "tesserocr":
+            _tess_api(lang)  # one model per worker; the ROI, box and column passes only change the PSM
+    except Exception as exc:  # jobs fail with the same error and report their pages
+        LOG.warning("OCR engine %r failed to load in worker %d: %s: %s", engine_chain, os.getpid(),
+                    type(exc).__name__, exc)
+        METRICS.incr("ocr_engine_load_errors")
+
+_OCR_POOL: Optional[Tuple[int, int, Any]] = None  # (owner pid, max workers, ProcessPoolExecutor)
+
+def _ocr_pool(workers: int) -> Any:
+    """
+    Process pool kept across calls (and across the issues of a batch), so its workers keep
+    their PdfSession and a resident OCR engine loaded. Workers are only started as jobs need them.
+    """
+    global _OCR_POOL
+    if _OCR_POOL is not None and _OCR_POOL[:2] == (os.getpid(), workers):
+        return _OCR_POOL[2]
+    _shutdown_ocr_pool()
+    from concurrent.futures import ProcessPoolExecutor
+    ex = ProcessPoolExecutor(max_workers=workers, initializer=_ocr_worker_init, initargs=(OCR_ENGINE, "deu+eng"))
+    _OCR_POOL = (os.getpid(), workers, ex)
+    METRICS.incr("ocr_pool_starts")
+    return ex
+
+def _shutdown_ocr_pool(kill: bool = False) -> None:
+    """Stop the shared pool; `kill` terminates busy workers too (a hung page must not block the next run)."""
+    global _OCR_POOL
+    pool, _OCR_POOL = _OCR_POOL, None
+    if pool is None or pool[0] != os.getpid():
+        return
+    ex = pool[2]
+    if kill:
+        for proc in list((getattr(ex, "_processes", None) or {}).values()):
+            proc.terminate()
+    ex.shutdown(wait=not kill, cancel_futures=True)
+
+atexit.register(_shutdown_ocr_pool)
+
+def _measured_job(fn: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Pool entry point: `fn(*args)` plus the worker's metrics since its last job (this job,
+    and model loads at worker start), for the parent to merge.
+    """
+    try:
+        result = fn(*args)
+    finally:
+        OCR_CACHE.flush()  # pool workers exit without atexit: write cache bookkeeping per job
+        snap = METRICS.snapshot()
+        METRICS.reset()
+    return result, snap
+
+def ocr_pages_parallel(pdf_path: str, pages: Iterable[int], max_workers: int = 0,
+                       page_timeout: float = 0, scale: float = 0.0, lang: str = "deu+eng",
+                       mode: str = "", session: Optional[PdfSession] = None,
+                       roi_fallback: bool = True) -> List[Optional[str]]:
+    """
+    Render and OCR `pages` across a process pool, one job per column/box (see `_plan_page_blocks`),
+    so even a single page uses every worker; results come back in page order.
+    A block that fails or exceeds `page_timeout` seconds is logged and left out instead of aborting
+    the run. A page is None when OCR broke (planning failed, or every block raised or timed out),
+    "" when OCR ran and read nothing.
+    `mode` is "roi" (box crops only) or "page" (all columns and boxes); defaults to OCR_MODE.
+    With `roi_fallback` False, a "roi" page where no box is located is not OCR'd further ("").
+    `scale` 0 lets the render profile (RENDER_PROFILE) pick it per page/box from page and font size.
+    When run in-process, the caller's `session` is reused.
+    """
+    pages = list(pages)
+    if not pages:
+        return []
+    METRICS.incr("ocr_fallback_pages", len(pages))
+    with METRICS.span("ocr"):
+        texts = _ocr_pages(pdf_path, pages, max_workers, page_timeout, scale, lang, mode, session, roi_fallback)
+    METRICS.incr("ocr_failed_pages", texts.count(None))
+    return texts
+
+def _ocr_pages(pdf_path: str, pages: List[int], max_workers: int, page_timeout: float, scale: float,
+               lang: str, mode: str, session: Optional[PdfSession], roi_fallback: bool) -> List[Optional[str]]:
+    timeout = page_timeout or OCR_PAGE_TIMEOUT
+    mode = mode or OCR_MODE
+    pool_size = max(1, max_workers or OCR_WORKERS or os.cpu_count() or 1)
+
+    if pool_size == 1:
+        return [_ocr_page_job(pdf_path, page1, scale, lang, timeout, mode, session, roi_fallback) for page1 in pages]
+
+    # Two stages on one pool: plan every page, then OCR every block, so the columns and boxes
+    # of a single page spread over all workers too. A failed block leaves a gap, not an empty page.
+    from concurrent.futures import TimeoutError as FuturesTimeout
+    from concurrent.futures.process import BrokenProcessPool
+    ex = _ocr_pool(pool_size)
+    stuck = False
+
+    def submit(fn: Callable[..., Any], *args: Any) -> Any:
+        try:
+            return ex.submit(_measured_job, fn, *args)
+        except BrokenProcessPool:
+            return None
+
+    def collect(fut: Any, page1: int, stage: str) -> Any:
+        """The job's result, or None (logged) if it raised, timed out or never ran."""
+        nonlocal stuck
+        try:
+            if fut is None:
+                raise BrokenProcessPool("pool broken before the job was submitted")
+            # Tesseract itself is killed after `timeout`; the margin covers rendering.
+            value, worker_metrics = fut.result(timeout=timeout + 30)
+            METRICS.merge(worker_metrics)
+            return value
+        except (FuturesTimeout, BrokenProcessPool) as exc:
+            stuck = True
+            if fut is not None:
+                fut.cancel()
+            _ocr_error(page1, stage, exc)
+        except Exception as exc:
+            _ocr_error(page1, stage, exc)
+        return None
+
+    plans = [submit(_plan_page_job, pdf_path, page1, lang, timeout, mode, roi_fallback) for page1 in pages]
+    jobs = []
+    for page1, fut in zip(pages, plans):
+        blocks = collect(fut, page1, "plan")
+        jobs.append((page1, None if blocks is None else
+                     [submit(_ocr_block_job, pdf_path, b, scale, lang, timeout) for b in blocks]))
+    texts: List[Optional[str]] = []
+    for page1, futs in jobs:
+        texts.append(None if futs is None else _join_blocks([collect(fut, page1, "block") for fut in futs]))
+    if stuck:  # a hung or dead worker: start the next run on a fresh pool
+        _shutdown_ocr_pool(kill=True)
+    return texts
 
 
 # ============================ Text extraction path ===========================
 
-def _read_text_layer(pdf_path: str, page1: int) -> str:
+@register_backend("text", "pdfium", requires=("pypdfium2",))
+def _text_backend_pdfium(session: PdfSession, page1: int) -> Dict[int, str]:
+    """Native pypdfium2 text page: one page in milliseconds, no extra dependency."""
+    tp = session.page(page1).get_textpage()
     try:
-        from RPA.PDF import PDF
-        pdf = PDF()
+        return {page1: tp.get_text_range().replace("\r\n", "\n")}
+    finally:
+        tp.close()
+
+@register_backend("text", "rpa", requires=("RPA.PDF",))
+def _text_backend_rpa(session: PdfSession, page1: int) -> Dict[int, str]:
+    """RPA.PDF (pdfminer) extracts the whole document in one go, so all of its pages are kept."""
+    from RPA.PDF import PDF
+    pdf = PDF()
+    try:
+        pdf.open_pdf(session.pdf_path)
+        try:
+            pages = pdf.get_text_from_all_pages()
+            if isinstance(pages, dict):
+                return {int(k): _as_text(v) for k, v in pages.items()}
+            return {page1: _as_text(pages)}
+        except AttributeError:
+            all_text = _as_text(pdf.get_text_from_pdf() or "")
+            if "\f" not in all_text:
+                return {page1: all_text}
+            return {i + 1: part for i, part in enumerate(all_text.split("\f"))}
+    finally:
         try:
-            pdf.open_pdf(pdf_path)
+            pdf.close_pdf()
+        except Exception:
+            pass
+
+@register_backend("text", "pypdf", requires=("pypdf",))
+def _text_backend_pypdf(session: PdfSession, page1: int) -> Dict[int, str]:
+    r = session.pypdf
+    i = page1 - 1
+    if 0 <= i < len(r.pages):
+        return {page1: r.pages[i].extract_text() or ""}
+    return {}
+
+def _extract_text_layer_pages(pdf_path: str, page1: int, session: Optional[PdfSession] = None,
+                              backend: str = "") -> Dict[int, str]:
+    """
+    Extract with the first usable text backend of `backend` or TEXT_BACKEND. The later engines
+    of the chain are imported only if it raises on this page, and tried in order; if all fail
+    the page counts as having no text layer (OCR decides).
+    """
+    chain = [n.strip() for n in (backend or TEXT_BACKEND).split(",") if n.strip()]
+    with (nullcontext(session) if session else PdfSession(pdf_path)) as s:
+        for i, name in enumerate(chain):
             try:
-                pages = pdf.get_text_from_all_pages()
-                if isinstance(pages, dict):
-                    key = str(page1)
-                    txt_for_page = _as_text(pages.get(key, pages))
-                else:
-                    txt_for_page = _as_text(pages)
-                return _as_text(txt_for_page)
-            except AttributeError:
-                all_text = _as_text(pdf.get_text_from_pdf() or "")
-                parts = all_text.split("\f") if "\f" in all_text else [all_text]
-                i = page1 - 1
-                return parts[i] if 0 <= i < len(parts) else all_text
-        finally:
+                fn = resolve_backend("text", name).fn
+            except RuntimeError:
+                continue
             try:
-                pdf.close_pdf()
+                return fn(s, page1)
             except Exception:
-                pass
-    except Exception:
-        pass
+                if any(backend_available("text", n) for n in chain[i + 1:]):
+                    METRICS.incr("text_backend_fallbacks")
+    return {}
 
-    # Fallback: PyPDF
-    try:
-        from pypdf import PdfReader
-        with open(pdf_path, "rb") as f:
-            r = PdfReader(f)
-            i = page1 - 1
-            if 0 <= i < len(r.pages):
-                return r.pages[i].extract_text() or ""
-    except Exception:
-        pass
+def _read_text_layer(pdf_path: str, page1: int, session: Optional[PdfSession] = None) -> str:
+    """Text layer of one page, served from the per-document cache (per backend chain) when possible."""
+    cached = TEXT_CACHE.get(pdf_path, page1, TEXT_BACKEND)
+    if cached is not None:
+        return cached
+    with METRICS.span("text_layer"):
+        pages = _extract_text_layer_pages(pdf_path, page1, session)
+    METRICS.incr("text_layer_extractions")
+    TEXT_CACHE.put_pages(pdf_path, pages, TEXT_BACKEND)
+    return pages.get(page1, "")
 
-    return ""
+_SCORER: Optional[baugesuch_quality.QualityScorer] = None
 
-def _extract_page_text_with_ocr_if_needed(pdf_path: str, page1: int, out_dir: str) -> str:
-    text = _as_text(_read_text_layer(pdf_path, page1))
-    if text.strip():
-        return text
+def _text_quality(text: str) -> baugesuch_quality.TextQuality:
+    """Readability of a text layer (page or box): labels, header/footer, known words, mojibake."""
+    global _SCORER
+    footer = _muni_regex().footer
+    if _SCORER is None or _SCORER.footer_re is not footer:
+        _SCORER = baugesuch_quality.QualityScorer(RE_LABEL_WORD, RE_HEADER, footer, n_labels=len(LABELS))
+    return _SCORER.score(text)
+
+def _extract_pages_text_with_ocr_if_needed(session: PdfSession, pages: Iterable[int],
+                                           ocr_workers: int = 0, roi_fallback: bool = True) -> Dict[int, str]:
+    """
+    Text layer per page; pages whose text layer is missing or scores too low are OCR'd
+    together in parallel. OCR text only replaces a text layer if it scores higher.
+    `roi_fallback` False (scan candidates): pages with no located box are not OCR'd whole.
+    """
+    texts: Dict[int, str] = {}
+    need_ocr: List[int] = []
+    with METRICS.span("page_text"):
+        for page1 in pages:
+            text = _as_text(session.text(page1))
+            texts[page1] = text
+            if session.method(page1) == "ocr":
+                need_ocr.append(page1)
+                if text.strip():
+                    METRICS.incr("low_quality_pages")
+    METRICS.incr("pages_scanned", len(texts))
     # OCR only if necessary
-    png_path = os.path.join(out_dir or ".", "baugesuch_page.png")
-    _render_pdf_page_to_png(pdf_path, page1, png_path, scale=3.0)
-    return _ocr_image_to_text(png_path)
+    ocr_texts = ocr_pages_parallel(session.pdf_path, need_ocr, max_workers=ocr_workers, session=session,
+                                   roi_fallback=roi_fallback)
+    for page1, text in zip(need_ocr, ocr_texts):
+        layer = texts[page1]
+        if text is None:  # OCR broke: keep what the layer has, and say so in the page's method
+            session.set_method(page1, "ocr_failed")
+            continue
+        if layer.strip() and _text_quality(text).score <= _text_quality(layer).score:
+            session.set_method(page1, "text")  # OCR read no better: keep the text layer
+            continue
+        texts[page1] = text
+    return texts
+
+def _find_candidate_pages(session: PdfSession) -> List[int]:
+    """
+    One cheap pass over the (cached) text layer: pages with a Baugesuch header or footer.
+    Pages whose text layer is missing or garbled are returned too, since only OCR can tell.
+    """
+    candidates: List[int] = []
+    footer = _muni_regex().footer
+    with METRICS.span("candidate_pages"):
+        for page1 in range(1, session.page_count() + 1):
+            t = session.text(page1)
+            if RE_HEADER.search(t) or footer.search(t) or session.method(page1) == "ocr":
+                candidates.append(page1)
+    return candidates
+
+
+# ========================= Layout-aware box extraction =========================
+
+def _text_layer_words(tp: Any, page_h: float) -> List[Dict[str, Any]]:
+    """
+    Group pdfium text-page characters into words (PDF points, top-left origin) in one pass.
+    Same shape as `_ocr_pnm_to_words`, so `_locate_box_regions` works on both.
+    """
+    n = tp.count_chars()
+    text = tp.get_text_range(0, n) if n else ""
+    words: List[Dict[str, Any]] = []
+    cur: Dict[str, Any] = {}
+    line = 0
+    for i, ch in enumerate(text):
+        if ch.isspace():
+            if ch == "\n":
+                line += 1
+            if cur:
+                words.append(cur)
+                cur = {}
+            continue
+        left, bottom, right, top = tp.get_charbox(i)
+        if right <= left:
+            continue
+        y0, y1 = page_h - top, page_h - bottom
+        if not cur:
+            cur = {"text": ch, "line": (0, 0, line), "x0": left, "y0": y0, "x1": right, "y1": y1}
+            continue
+        cur["text"] += ch
+        cur["x0"], cur["y0"] = min(cur["x0"], left), min(cur["y0"], y0)
+        cur["x1"], cur["y1"] = max(cur["x1"], right), max(cur["y1"], y1)
+    if cur:
+        words.append(cur)
+    return words
+
+def _extract_layout_boxes(session: PdfSession, page1: int) -> List[Dict[str, Any]]:
+    """
+    Find every header..footer box on a text-layer page from character coordinates.
+    Returns [{"page", "bbox": (x0, y0, x1, y1) in PDF points, top-left origin, "text", "text_pt"}],
+    ordered left to right, top to bottom. Empty if the page has no text layer or no boxes.
+    """
+    try:
+        p = session.page(page1)
+    except (ImportError, IndexError):
+        return []
+    with METRICS.span("layout_boxes"):
+        tp = p.get_textpage()
+        try:
+            page_w, page_h = p.get_size()
+            words = _text_layer_words(tp, page_h)
+            regions = _locate_box_regions(words, page_w, page_h, 1.0)
+            boxes = [
+                {"page": page1, "bbox": r,
+                 "text": tp.get_text_bounded(left=r[0], bottom=page_h - r[3], right=r[2], top=page_h - r[1]),
+                 "text_pt": _estimate_text_pt([w for w in words if r[0] <= w["x0"] < r[2] and r[1] <= w["y0"] < r[3]])}
+                for r in regions
+            ]
+        finally:
+            tp.close()
+    METRICS.incr("layout_boxes", len(boxes))
+    return boxes
+
+def _ocr_weak_boxes(session: PdfSession, page1: int, boxes: List[Dict[str, Any]]) -> None:
+    """Per-region fallback: a box whose text layer scores too low is replaced by OCR of its crop."""
+    weak = [b for b in boxes if not _text_quality(b["text"]).usable]
+    if not weak:
+        return
+    with METRICS.span("region_ocr"):
+        for box in weak:
+            try:
+                pnm = _render_for_ocr(session, page1, region=box["bbox"], text_pt=box.get("text_pt", 0.0))
+                text = _ocr_pnm_to_text(pnm, timeout=OCR_PAGE_TIMEOUT)
+            except Exception:
+                continue
+            if _text_quality(text).score > _text_quality(box["text"]).score:
+                box["text"] = text
+                METRICS.incr("ocr_regions")
 
 
 # ============================= Box discovery/parsing =============================
 
+def _find_municipal_boxes(txt: str) -> List[Tuple[Optional[Municipality], str]]:
+    """
+    Return (Gemeinde, box) for every header..footer box (header removed), collapsed once.
+    One scan for all registered Gemeinden: the footer that closes a box names its Gemeinde.
+    """
+    with METRICS.span("box_regex"):
+        t = _collapse_text(txt)
+        registry = _municipalities()
+        hits = [(registry.from_group(m.lastgroup), m.group()) for m in _muni_regex().box.finditer(t)]
+    return [(muni, RE_HEADER_LINE.sub("", b, count=1).strip()) for muni, b in hits]
+
 def _find_boxes_in_text(txt: str) -> List[str]:
     """Return header..footer boxes (header removed), collapsed once."""
-    t = _collapse_text(txt)
-    hits = RE_BOX.findall(t)
-    if not hits:
-        return []
-    cleaned = [RE_HEADER_LINE.sub("", b, count=1).strip() for b in hits]
-    return cleaned
+    return [b for _, b in _find_municipal_boxes(txt)]
 
 def _split_entries_by_labels(page_text: str) -> List[str]:
     """Fallback: segment by labels if headers are missing from OCR."""
     page = _collapse_text(page_text)
     # soft paragraphing to help breaks
-    page = re.sub(r"([.:;])\s+(?=[A-ZÄÖÜ])", r"\1\n\n", page)
-    starts = [m.start() for m in re.finditer(r"\bBauherrschaft\b", page)]
+    page = RE_SENTENCE_BREAK.sub(r"\1\n\n", page)
+    starts = [m.start() for m in RE_BAUHERRSCHAFT_WORD.finditer(page)]
     blocks: List[str] = []
     for i, pos in enumerate(starts):
         end = starts[i + 1] if i + 1 < len(starts) else len(page)
         block = page[pos:end].strip()
-        hits = sum(1 for lab in LABELS if re.search(rf"\b{lab}\b", block))
-        if hits >= 3:
+        if _count_labels(block, 3) >= 3:
             blocks.append(block)
     return blocks
 
+def _count_labels(block: str, enough: int = len(LABELS)) -> int:
+    """Distinct label words in `block`, from one scan that stops once `enough` are seen."""
+    seen = set()
+    for m in RE_LABEL_WORD.finditer(block):
+        seen.add(m.group(0))
+        if len(seen) >= enough:
+            break
+    return len(seen)
+
 def _slice_fields_by_positions(core: str) -> Dict[str, str]:
     """Robustly slice values between actual label positions; tolerant to glued labels."""
     result = {lab: "" for lab in LABELS}
@@ -193,94 +1198,141 @@ def _slice_fields_by_positions(core: str) -> Dict[str, str]:
         lab = m.group("label").title()
         start = m.end()
         end = matches[i + 1].start() if i + 1 < len(matches) else len(core)
-        val = core[start:end]
-        # compact normalization pass
-        val = RE_SOFT_HYPH.sub("", val)
-        val = RE_HYPHEN_NL.sub("", val)
-        val = RE_JOIN_LINES.sub(" ", val)
-        val = RE_SPACES.sub(" ", val)
-        val = RE_CAMEL_GAP.sub(" ", val)
-        result[lab] = val.strip(" ·;:,")
+        result[lab] = _normalize(core[start:end], "field")
     return result
 
+# ============================= Rescue pattern library =============================
+
+class RescuePattern(NamedTuple):
+    field: str
+    name: str
+    priority: int                        # lower runs first; the first hit wins
+    regex: Optional["re.Pattern[str]"]   # None: `requires` alone decides
+    template: str                        # m.expand() template, or the literal value when regex is None
+    requires: Tuple[str, ...]            # substrings that must all occur (cheap pre-check)
+    overwrite: bool                      # canonical value: replace the sliced one, not only fill it
+
+_RESCUE: Dict[str, List[RescuePattern]] = {}
+
+# the rescue pass only ever looks at this many characters of a block
+RESCUE_WINDOW = 4000
+
+def register_rescue_pattern(field: str, name: str, regex: Any = None, priority: int = 50, template: str = r"\1",
+                            requires: Tuple[str, ...] = (), overwrite: bool = False) -> RescuePattern:
+    """
+    Add (or replace, by `name`) a rescue pattern for `field`. Patterns of a field run in
+    priority order and stop at the first hit. String regexes are compiled case-insensitive.
+    """
+    if isinstance(regex, str):
+        regex = re.compile(regex, re.I)
+    pat = RescuePattern(field, name, priority, regex, template, tuple(requires), overwrite)
+    pats = [p for p in _RESCUE.get(field, []) if p.name != name] + [pat]
+    pats.sort(key=lambda p: p.priority)
+    _RESCUE[field] = pats
+    return pat
+
+def rescue_patterns(field: str) -> List[str]:
+    return [p.name for p in _RESCUE.get(field, [])]
+
+def _rescue_candidate(field: str, text: str) -> Tuple[str, Optional[RescuePattern]]:
+    """First matching pattern's value for `field` (short-circuit), or ("", None)."""
+    window = text[:RESCUE_WINDOW]
+    for p in _RESCUE.get(field, ()):
+        if p.requires and not all(r in window for r in p.requires):
+            continue
+        if p.regex is None:
+            return p.template, p
+        m = p.regex.search(window)
+        if m:
+            return m.expand(p.template), p
+    return "", None
+
+register_rescue_pattern("Bauherrschaft", "wuerenlos-address", RE_RESCUE_BH, 10)
+register_rescue_pattern("Bauherrschaft", "name-street-plz", RE_RESCUE_BH_ANY, 50)
+register_rescue_pattern("Bauvorhaben", "silo-milchkuh", RE_RESCUE_BV, 10, requires=("Parzelle",))
+register_rescue_pattern("Bauvorhaben", "erweiterung-milchkuh", RE_RESCUE_BV_LOOSE, 20, requires=("Parzelle",))
+register_rescue_pattern("Bauvorhaben", "after-address", RE_RESCUE_BV_ANY, 50)
+register_rescue_pattern("Lage", "parzelle-plan-street", RE_RESCUE_LAGE, 10)
+register_rescue_pattern("Lage", "parzelle-any", RE_RESCUE_LAGE_ANY, 50)
+register_rescue_pattern("Zone", "landschaftsschutz", RE_LANDSCHAFTSZONE, 10,
+                        "Ausserhalb Bauzone – Landschaftsschutzzone", ("Ausserhalb Bauzone",), overwrite=True)
+register_rescue_pattern("Zone", "wald", None, 20, "Ausserhalb Bauzone – Wald", ("Ausserhalb Bauzone", "Wald"),
+                        overwrite=True)
+register_rescue_pattern("Zone", "ausserhalb-bauzone", RE_RESCUE_ZONE_OUTSIDE, 30, r"Ausserhalb Bauzone – \1")
+register_rescue_pattern("Zone", "label", RE_RESCUE_ZONE_LABEL, 50)
+register_rescue_pattern("Zusatzgesuch", "departement-bvu", RE_DEPARTEMENT_BVU, 10,
+                        "Departement Bau, Verkehr und Umwelt", overwrite=True)
+
+def _apply_canonical_zone(text: str, fields: Dict[str, str]) -> None:
+    zone, pat = _rescue_candidate("Zone", text)
+    if pat is not None and (pat.overwrite or not fields["Zone"]):
+        fields["Zone"] = zone
+
 def _pick_longer(current: str, candidate: str) -> str:
     """Return candidate if it's meaningfully better (longer & not just a prefix)."""
     c = (candidate or "").strip()
     cur = (current or "").strip()
     if len(c) > len(cur) + 8:  # small margin
         return c
-    return cur
+    return current if cur == current else cur  # unchanged: keep a `_Clean` value as it is
 
 def _upgrade_from_global_patterns(block: str, fields: Dict[str, str]) -> Dict[str, str]:
     """
     If label-slicing produced weak/partial values (common on RIGHT box),
-    salvage each field from the whole block with tolerant regexes.
+    salvage each field from the whole block with the rescue pattern library.
     Prefer canonical 'Parzelle ...' for Lage even if shorter.
     """
     b = _clean_spaces(block)
+    lexicon = baugesuch_lexicon.get_lexicon()
 
     # --- Bauherrschaft: "Lastname Firstname, Street 43, 5436 Würenlos"
-    m_bh = re.search(
-        r"(?:Bauherrschaft\s*:?\s*)?"
-        r"([A-ZÄÖÜ][\wÄÖÜäöüß\-. ]+?,\s*[A-Za-zÄÖÜäöüß\-]+(?:strasse|straße|str\.?)\s*\d+,\s*5436\s*W[üu]renlos)",
-        b, flags=re.I
-    )
-    if m_bh:
-        cand = (m_bh.group(1)
-                .replace("Bunten", "Büntern")
-                .replace("Bünten", "Büntern"))
-        fields["Bauherrschaft"] = _pick_longer(fields["Bauherrschaft"], cand)
-
-    m_bv = re.search(
-        r"(Erweiterung\s*Silo[\w\-]*\s*anlage?\s*und\s*Umnutzung\s*Stall\s*\(teilweise\)\s*in\s*Milchkuh[\w\-]*boxen)"
-        r"(?=.*?\bParzelle\b)",  
-        b, flags=re.I | re.S
-    )
-    if not m_bv:
-        m_bv = re.search(r"(Erweiterung.*?Milchkuh[\w\-]*boxen)(?=.*?\bParzelle\b)", b, flags=re.I | re.S)
-    if m_bv:
-        cand = (m_bv.group(1)
-                .replace("Siloanlage", "Silolanlage"))
+    cand, _ = _rescue_candidate("Bauherrschaft", b)
+    if cand:
+        fields["Bauherrschaft"] = _pick_longer(fields["Bauherrschaft"], lexicon.correct("Bauherrschaft", cand))
+
+    cand, _ = _rescue_candidate("Bauvorhaben", b)
+    if cand:
+        cand = lexicon.correct("Bauvorhaben", cand)
         if len(cand) > len(fields["Bauvorhaben"]) + 5:
             fields["Bauvorhaben"] = _clean_spaces(cand)
 
-    m_lage = re.search(
-        r"(Parzelle\s*\d+\s*\(Plan\s*\d+\)\s*,\s*[A-Za-zÄÖÜäöüß\-]+(?:strasse|straße|str\.?)\s*\d+)",
-        b, flags=re.I
-    )
-    if m_lage:
-        cand = (m_lage.group(1)
-                .replace("Bunten", "Büntern")
-                .replace("Bünten", "Büntern")
-                .replace("Tägerhard", "Tägerhard"))
+    cand, _ = _rescue_candidate("Lage", b)
+    if cand:
+        cand = lexicon.correct("Lage", cand)
         cur = fields.get("Lage", "")
 
-        if ("Erweiterung" in cur or "Umnutzung" in cur or not re.match(r"^\s*Parzelle\b", cur, flags=re.I)):
+        if ("Erweiterung" in cur or "Umnutzung" in cur or not RE_PARZELLE_START.match(cur)):
             fields["Lage"] = _clean_spaces(cand)
         else:
             fields["Lage"] = _clean_spaces(cand) if len(cand) > len(cur) + 4 else _clean_spaces(cur)
 
-    if "Ausserhalb Bauzone" in b and re.search(r"Landschafts[\w\-]*zone", b, flags=re.I):
-        fields["Zone"] = "Ausserhalb Bauzone – Landschaftsschutzzone"
-    elif "Ausserhalb Bauzone" in b and "Wald" in b:
-        fields["Zone"] = "Ausserhalb Bauzone – Wald"
+    _apply_canonical_zone(b, fields)
 
-    if re.search(r"Departement\s*Bau,\s*Verkehr\s*und\s*Umwelt", b, flags=re.I):
-        fields["Zusatzgesuch"] = "Departement Bau, Verkehr und Umwelt"
+    cand, pat = _rescue_candidate("Zusatzgesuch", b)
+    if pat is not None and (pat.overwrite or not fields["Zusatzgesuch"]):
+        fields["Zusatzgesuch"] = cand
 
     for k in list(fields.keys()):
         fields[k] = _clean_spaces(fields[k])
 
     return fields
 
-def _parse_entry(block: str) -> Dict[str, str]:
-    """Parse one Baugesuch box into normalized fields."""
+def _parse_entry(block: str, gemeinde: Optional[Municipality] = None) -> Dict[str, str]:
+    """Parse one Baugesuch box into normalized fields (the Gemeinde is classified if not given)."""
+    with METRICS.span("parse_entry"):
+        return _parse_entry_fields(block, gemeinde)
+
+def _parse_entry_fields(block: str, gemeinde: Optional[Municipality]) -> Dict[str, str]:
+    registry = _municipalities()
+    if gemeinde is None:
+        gemeinde = registry.classify(block)
+
     # 1) Cut out "others" (Gesuchsauflage… [footer|next header])
     others = ""
     mstart = RE_GESUCHS.search(block)
     if mstart:
         s = mstart.start()
-        mfooter = RE_FOOTER.search(block, s)
+        mfooter = _muni_regex().footer.search(block, s)
         if mfooter:
             e = mfooter.end()
         else:
@@ -295,20 +1347,18 @@ def _parse_entry(block: str) -> Dict[str, str]:
     fields = _slice_fields_by_positions(core)
 
     # 3) Normalizations to match expected output (fast path)
-    if "Ausserhalb Bauzone" in block and "Landschaftsschutzzone" in block:
-        fields["Zone"] = "Ausserhalb Bauzone – Landschaftsschutzzone"
-    elif "Ausserhalb Bauzone" in block and "Wald" in block:
-        fields["Zone"] = "Ausserhalb Bauzone – Wald"
-
-    fields["Lage"] = (fields["Lage"]
-                      .replace("‚", "").replace("’", "").replace("‘", "")
-                      .replace("Tägerhard", "Tägerhard")
-                      .replace(" - ", " – "))
-    fields["Bauvorhaben"] = fields["Bauvorhaben"].replace("Siloanlage", "Silolanlage")
-    fields["Bauherrschaft"] = re.sub(r"(?i)(gemeinde)(?= *w[üu]renlos)", r"\1 ", fields["Bauherrschaft"])
+    _apply_canonical_zone(block, fields)
+
+    # both return the `_Clean` value itself when nothing changes: only rewritten fields are re-normalized
+    lexicon = baugesuch_lexicon.get_lexicon()
+    for k in LABELS:
+        fields[k] = lexicon.correct(k, fields[k])
+    bauherr, gaps = registry.matchers.gemeinde_gap.subn(r"\1 ", fields["Bauherrschaft"])
+    if gaps:
+        fields["Bauherrschaft"] = bauherr
 
     if "Parzelle" in fields["Bauvorhaben"]:
-        fields["Bauvorhaben"] = _clean_spaces(re.split(r"\bParzelle\b", fields["Bauvorhaben"], maxsplit=1)[0])
+        fields["Bauvorhaben"] = _clean_spaces(RE_PARZELLE_WORD.split(fields["Bauvorhaben"], maxsplit=1)[0])
 
     # 4) Rescue pass for weak/broken fields (RIGHT box common)
     needs_rescue = (
@@ -316,21 +1366,19 @@ def _parse_entry(block: str) -> Dict[str, str]:
         len(fields["Bauvorhaben"]) < 25 or
         "Siloan" in fields["Bauvorhaben"] or
         ("Parzelle" in block and "Plan" in block and "Büntern" in block and len(fields["Lage"]) < 25) or
-        not re.match(r"^\s*Parzelle\b", fields.get("Lage", ""), flags=re.I)
+        not RE_PARZELLE_START.match(fields.get("Lage", ""))
     )
     if needs_rescue:
-        fields = _upgrade_from_global_patterns(block, fields)
+        METRICS.incr("rescue_triggered")
+        with METRICS.span("rescue"):
+            fields = _upgrade_from_global_patterns(block, fields)
 
     # 5) Normalize others to single line + exactly one footer
     if others:
-        o = RE_SOFT_HYPH.sub("", others)
-        o = RE_HYPHEN_NL.sub("", o)
-        o = RE_JOIN_LINES.sub(" ", o)
-        o = RE_SPACES.sub(" ", o).strip()
-        o = RE_FOOTER_MULT.sub("BAUVERWALTUNG WÜRENLOS", o)
-        if "BAUVERWALTUNG WÜRENLOS" not in o:
-            o += " BAUVERWALTUNG WÜRENLOS"
-        others = _clean_spaces(o)
+        o = _normalize(others, "others")
+        if gemeinde is not None and gemeinde.footer not in o:
+            o = _clean_spaces(o + " " + gemeinde.footer)
+        others = o
 
     for k in list(fields.keys()):
         fields[k] = _clean_spaces(fields[k])
@@ -342,39 +1390,177 @@ def _parse_entry(block: str) -> Dict[str, str]:
         "Zone":          fields["Zone"],
         "Zusatzgesuch":  fields["Zusatzgesuch"],
         "others":        others or "",
+        "Gemeinde":      gemeinde.name if gemeinde is not None else "",
     }
 
+def _parse_page_entries(page_text: str, gemeinden: Optional[Sequence[Municipality]] = None) -> List[Dict[str, str]]:
+    """Parse the (last two) boxes of each selected Gemeinde (default: `_select_gemeinden()`) of one page's text."""
+    selected = list(gemeinden) if gemeinden is not None else _select_gemeinden()
+    by_key: Dict[str, List[str]] = {m.key: [] for m in selected}
+    for muni, b in _find_municipal_boxes(page_text):
+        if muni is not None and muni.key in by_key:
+            by_key[muni.key].append(b)
+
+    registry = _municipalities()
+    fallback: Optional[List[Tuple[Optional[Municipality], str]]] = None
+    entries: List[Dict[str, str]] = []
+    for muni in selected:
+        boxes = by_key[muni.key]
+        if len(boxes) < 2:
+            if fallback is None:  # label split once per page, shared by every Gemeinde
+                fallback = [(registry.classify(b), b) for b in _split_entries_by_labels(page_text)]
+            boxes = [b for m, b in fallback if m is not None and m.key == muni.key]
+        entries.extend(_parse_entry(b, muni) for b in boxes[-2:])
+    return entries
+
+def _parse_layout_entries(boxes: List[Dict[str, Any]],
+                          gemeinden: Optional[Sequence[Municipality]] = None) -> List[Dict[str, str]]:
+    """Parse every box of the selected Gemeinden found by `_extract_layout_boxes` (not just the last two)."""
+    keys = {m.key for m in (gemeinden if gemeinden is not None else _select_gemeinden())}
+    entries: List[Dict[str, str]] = []
+    for box in boxes:
+        for muni, b in _find_municipal_boxes(box["text"]):
+            if muni is not None and muni.key in keys:
+                entries.append(_parse_entry(b, muni))
+    return entries
+
 
 # ================================ Public API =================================
 
-def parse_baugesuch_from_pdf(pdf_path: str, page: int, output_json_path: str, scan_all: bool = True) -> str:
+def _load_pages(session: PdfSession, page: int, scan_all: bool, ocr_workers: int) -> Tuple[List[int], Dict[int, str]]:
+    """Pick the pages to parse and fetch their text (text layer, parallel OCR where missing)."""
+    if not scan_all:
+        n = session.page_count()
+        if not 1 <= page <= n:
+            raise IndexError(f"Page {page} out of range (pdf has {n} pages)")
+    pages = _find_candidate_pages(session) if scan_all else [page]
+    # only a page asked for by number is OCR'd whole when ROI finds no box on it
+    return pages, _extract_pages_text_with_ocr_if_needed(session, pages, ocr_workers=ocr_workers,
+                                                         roi_fallback=not scan_all)
+
+def _parse_page(session: PdfSession, page1: int, page_text: str,
+                gemeinden: Sequence[Municipality]) -> List[Dict[str, str]]:
     """
-    Parse the two Würenlos Baugesuch boxes on the given page (bottom-left then bottom-right),
-    write them to JSON, and return the JSON string.
+    Text-layer pages: spatial box grouping first (weak boxes OCR'd from their crop),
+    flat-text regex as fallback.
     """
+    page_entries: List[Dict[str, str]] = []
+    if session.method(page1) == "text":
+        boxes = _extract_layout_boxes(session, page1)
+        _ocr_weak_boxes(session, page1, boxes)
+        page_entries = _parse_layout_entries(boxes, gemeinden)
+    if not page_entries:
+        METRICS.incr("regex_fallback_pages")
+        page_entries = _parse_page_entries(page_text, gemeinden)
+    METRICS.incr("boxes_found", len(page_entries))
+    return page_entries
+
+def _issue_artefacts(pdf_path: str, debug_dir: str, level: str) -> baugesuch_debug.IssueArtefacts:
+    return baugesuch_debug.IssueArtefacts(debug_dir, os.path.splitext(os.path.basename(pdf_path))[0], level)
+
+def _record_debug(art: baugesuch_debug.IssueArtefacts, session: PdfSession, page1: int, page_text: str,
+                  entries: List[Dict[str, str]]) -> None:
+    """Queue a page's debug artefacts if its level asks for them; OCR'd pages also get a page image."""
+    if not art.wants(entries):
+        return
+    method = session.method(page1)
+    ocr = method != "text"
+    image = None
+    if ocr:
+        try:
+            image = session.render_pnm(page1, ROI_LOCATE_SCALE, grayscale=True)
+        except Exception:
+            pass
+    art.page(page1, page_text, entries, method, image)
+    METRICS.incr("debug_pages")
+
+def _open_session(pdf_path: str) -> PdfSession:
     if not os.path.isfile(pdf_path):
         raise FileNotFoundError(f"PDF not found: {pdf_path}")
+    return PdfSession(pdf_path)
 
-    out_dir = _ensure_dir(output_json_path)
+def iter_baugesuch_entries(pdf_path: str, page: int = 0, scan_all: bool = True, ocr_workers: int = 0,
+                           scan_info: Optional[Dict[str, Any]] = None, debug_dir: str = "",
+                           debug: str = "", gemeinden: str = "") -> Iterator[Tuple[int, int, Dict[str, str]]]:
+    """
+    Yield (page, box_index, entry) for every box of the selected `gemeinden` as soon as its
+    page is parsed; each entry carries its "Gemeinde".
+    Same page selection as `parse_baugesuch_from_pdf`. Nothing is written to disk unless
+    `debug_dir` (or BAUGESUCH_DEBUG_DIR) is set, then debug artefacts go there per `debug` level.
+    If given, `scan_info` is filled with the scanned "pages" and the extraction "methods"
+    used per page ("text", "ocr", or "ocr_failed" when OCR broke on it).
+    """
+    selected = _select_gemeinden(gemeinden)
+    art = _issue_artefacts(pdf_path, debug_dir or baugesuch_debug.DEBUG_DIR, debug)
+    try:  # also when the consumer stops early or a page raises
+        with METRICS.span("open"):
+            session = _open_session(pdf_path)
+        with session:
+            pages, page_texts = _load_pages(session, page, scan_all, ocr_workers)
+            if scan_info is not None:
+                scan_info["pages"] = pages
+                scan_info["methods"] = {p: session.method(p) for p in pages}
+            for page1 in pages:
+                page_entries = _parse_page(session, page1, page_texts[page1], selected)
+                _record_debug(art, session, page1, page_texts[page1], page_entries)
+                for i, entry in enumerate(page_entries):
+                    yield page1, i, entry
+    finally:
+        art.close()
 
-    page_text = _extract_page_text_with_ocr_if_needed(pdf_path, page, out_dir)
-    with open(os.path.join(out_dir, "page_text_debug.txt"), "w", encoding="utf-8") as f:
-        f.write(page_text)
+def parse_baugesuch_from_pdf(pdf_path: str, page: int, output_json_path: str, scan_all: bool = True,
+                             ocr_workers: int = 0, debug: str = "", gemeinden: str = "") -> str:
+    """
+    Parse the Baugesuch boxes (bottom-left then bottom-right), write them to JSON,
+    and return the JSON string. On text-layer pages every box is located from character
+    coordinates; otherwise the last two boxes per Gemeinde of the flat page text are used.
 
-    boxes = [b for b in _find_boxes_in_text(page_text) if _looks_like_wurenlos(b)]
+    `gemeinden` picks the Gemeinden from the municipality registry: comma-separated names or
+    "all" (default BAUGESUCH_GEMEINDEN, i.e. Würenlos). All of them come out of the same
+    extraction; with more than one selected, every entry gets a "Gemeinde" field.
 
-    entries: List[Dict[str, str]] = []
-    if len(boxes) >= 2:
-        for b in boxes[-2:]:  
-            entries.append(_parse_entry(b))
-    else:
-        candidates = [b for b in _split_entries_by_labels(page_text) if _looks_like_wurenlos(b)]
-        for b in candidates[-2:]:
-            entries.append(_parse_entry(b))
+    With scan_all=True the whole issue is scanned: candidate pages are picked from the text
+    layer (header/footer hits) and only those are parsed; `page` is ignored.
+    With scan_all=False only `page` (1-based) is parsed.
+    Pages without a text layer are OCR'd in parallel (`ocr_workers`, 0 = one per core).
+    The PDF is opened once (PdfSession) and shared by every stage.
+    Stage timings and counters of the run go to metrics.json / metrics.prom next to the
+    output and into the Robot log.
 
-    entries = entries[-2:]  
+    Debug artefacts (page text, entries, page image for OCR'd pages) are written in the
+    background to <output dir>/debug/<issue>/ (or BAUGESUCH_DEBUG_DIR) according to `debug`:
+    "off", "failure" (pages with no or incomplete entries; default, BAUGESUCH_DEBUG) or "always".
+    """
+    selected = _select_gemeinden(gemeinden)
+    before = METRICS.snapshot()
+    with METRICS.span("parse_total"):
+        debug_dir = baugesuch_debug.DEBUG_DIR or os.path.join(os.path.dirname(output_json_path) or ".", "debug")
+        entries = [entry for _, _, entry in iter_baugesuch_entries(
+            pdf_path, page, scan_all, ocr_workers, debug_dir=debug_dir, debug=debug, gemeinden=gemeinden)]
+        out_dir = _ensure_dir(output_json_path)
+        if len(selected) == 1:  # single-Gemeinde output keeps its original schema
+            for e in entries:
+                e.pop("Gemeinde", None)
 
-    with open(output_json_path, "w", encoding="utf-8") as f:
-        json.dump(entries, f, ensure_ascii=False, indent=2)
+        with METRICS.span("write_output"):
+            with open(output_json_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False, indent=2)
 
+    run = baugesuch_metrics.diff(before, METRICS.snapshot())
+    baugesuch_metrics.write_reports(out_dir, run)
+    baugesuch_metrics.log_to_robot(run)
     return json.dumps(entries, ensure_ascii=False, indent=2)
+
+def get_baugesuch_metrics(fmt: str = "json") -> str:
+    """
+    Robot Keyword: cumulative stage timings and counters of this process,
+    as JSON (fmt="json"), Prometheus text (fmt="prometheus") or a plain table (fmt="table").
+    Example:
+        ${prom}=    Get Baugesuch Metrics    prometheus
+    """
+    snap = METRICS.snapshot()
+    if fmt == "prometheus":
+        return baugesuch_metrics.to_prometheus(snap)
+    if fmt == "table":
+        return baugesuch_metrics.format_table(snap)
+    return baugesuch_metrics.to_json(snap)
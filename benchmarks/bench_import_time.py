@@ -0,0 +1,93 @@
+"""
+Cold-start cost of baugesuch_reader, as paid by every short-lived rcc/Robot run.
+
+    python -m benchmarks.bench_import_time [--runs 10]
+
+Each measurement is a fresh interpreter. Reports the median wall time of
+`import baugesuch_reader`, then of importing it and resolving each text backend and
+OCR engine, together with the heavy engine modules that ended up in sys.modules.
+`--top N` also prints the slowest imports from `python -X importtime`.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+import baugesuch_reader as reader
+
+ENGINE_MODULES = ("pypdfium2", "pypdf", "RPA.PDF", "pytesseract", "PIL.Image", "tesserocr", "numpy",
+                  "sqlite3", "concurrent.futures")
+
+_PROBE = """
+import sys, time
+t = time.perf_counter()
+import baugesuch_reader as r
+{select}
+dt = time.perf_counter() - t
+mods = [m for m in {mods!r} if m in sys.modules]
+print(dt, ",".join(mods))
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(select: str) -> Tuple[float, str]:
+    code = _PROBE.format(select=select, mods=ENGINE_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    dt, _, mods = out.stdout.strip().partition(" ")
+    return float(dt), mods
+
+
+def measure(select: str, runs: int) -> Tuple[float, str]:
+    times: List[float] = []
+    mods = ""
+    for _ in range(runs):
+        dt, mods = _run(select)
+        times.append(dt)
+    return statistics.median(times) * 1e3, mods
+
+
+def top_imports(n: int) -> List[Tuple[int, str]]:
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import baugesuch_reader"],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    rows: List[Tuple[int, str]] = []
+    for line in out.stderr.splitlines():
+        parts = line.replace("import time:", "").split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((int(parts[1]), parts[2].strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--top", type=int, default=0)
+    args = ap.parse_args()
+
+    scenarios = [("import only", "")]
+    scenarios += [(f"text={n}", f"r.resolve_backend('text', {n!r})") for n in reader.backend_names("text")]
+    scenarios += [(f"ocr={n}", f"r.resolve_backend('ocr', {n!r})") for n in reader.backend_names("ocr")]
+
+    print(f"{'scenario':<22} {'median ms':>10}  loaded engine modules")
+    for label, select in scenarios:
+        try:
+            ms, mods = measure(select, args.runs)
+        except subprocess.CalledProcessError as e:
+            err = (e.stderr or "").strip().splitlines()
+            print(f"{label:<22} {'skipped':>10}  {err[-1] if err else e}")
+            continue
+        print(f"{label:<22} {ms:>10.1f}  {mods or '-'}")
+
+    if args.top:
+        print("\nslowest imports (cumulative µs) for `import baugesuch_reader`:")
+        for us, name in top_imports(args.top):
+            print(f"{us:>10}  {name}")
+
+
+if __name__ == "__main__":
+    main()
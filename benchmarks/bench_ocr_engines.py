@@ -0,0 +1,63 @@
+"""
+Compare the OCR engines of baugesuch_reader on rendered page crops.
+
+    python -m benchmarks.bench_ocr_engines [input/limmatwelle-22-mai.pdf] [--page 12] [--images 20]
+
+The page is rendered per the render profile (BAUGESUCH_RENDER_PROFILE) as --images horizontal strips; every engine OCRs all of
+them in one process, bypassing OCR_CACHE. "first ms" includes starting the engine and loading
+its models; "ms/image" over the rest shows what each further page costs (resident engines
+such as tesserocr load the traineddata only once). Unavailable engines are listed as skipped.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Dict, List
+
+import baugesuch_reader as reader
+
+
+def render_strips(pdf_path: str, page1: int, n: int, scale: float) -> List[bytes]:
+    with reader.PdfSession(pdf_path) as session:
+        page_w, page_h = session.page_size(page1)
+        step = page_h / n
+        return [reader._render_for_ocr(session, page1, scale, (0, i * step, page_w, (i + 1) * step)) for i in range(n)]
+
+
+def bench_engine(name: str, images: List[bytes], lang: str) -> Dict[str, float]:
+    fn = reader.resolve_backend("ocr", name).fn
+    times: List[float] = []
+    chars = 0
+    for pnm in images:
+        t0 = time.perf_counter()
+        chars += len(fn(pnm, lang, 0, 6))
+        times.append(time.perf_counter() - t0)
+    rest = times[1:] or times
+    return {"first_ms": times[0] * 1e3, "per_image_ms": sum(rest) / len(rest) * 1e3,
+            "total_ms": sum(times) * 1e3, "chars": chars}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("pdf", nargs="?", default="input/limmatwelle-22-mai.pdf")
+    ap.add_argument("--page", type=int, default=12)
+    ap.add_argument("--images", type=int, default=20)
+    ap.add_argument("--scale", type=float, default=0.0, help="0 = automatic (render profile)")
+    ap.add_argument("--lang", default="deu+eng")
+    ap.add_argument("--engines", default=",".join(reader.backend_names("ocr")))
+    args = ap.parse_args()
+
+    images = render_strips(args.pdf, args.page, args.images, args.scale)
+    print(f"{len(images)} images, {sum(len(i) for i in images) / 2**20:.1f} MiB of pixels\n")
+    print(f"{'engine':<14} {'first ms':>10} {'ms/image':>10} {'total ms':>10} {'chars':>8}")
+    for name in [n.strip() for n in args.engines.split(",") if n.strip()]:
+        try:
+            r = bench_engine(name, images, args.lang)
+        except Exception as e:  # missing optional dependency, no tesseract binary, ...
+            print(f"{name:<14} skipped: {type(e).__name__}: {e}")
+            continue
+        print(f"{name:<14} {r['first_ms']:>10.1f} {r['per_image_ms']:>10.1f} {r['total_ms']:>10.1f} {r['chars']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark and regression harness for the text-parsing stages of baugesuch_reader.
+
+    python -m benchmarks.bench_parser [--extra output/debug/<issue>] [--fail-under 0.9]
+
+Corpus: benchmarks/corpus/<name>[.<variant>].txt page texts ("\\f" separates pages) with
+golden entries in <name>.<variant>.json, else <name>.json. A variant whose text layer is known
+to be degraded (pypdf glues words) gets its own golden of the accepted output, so the gate
+catches regressions on it instead of failing on it forever. Extra texts (files, or directories
+such as the pNNN.txt debug artefacts of a run) are timed but have no golden. For every stage it
+reports calls/s, boxes/s, input chars/s and peak traced memory; then field-level accuracy of the
+full text path against golden.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import baugesuch_reader as reader
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+FIELDS = ("Bauherrschaft", "Bauvorhaben", "Lage", "Zone", "Zusatzgesuch", "others")
+
+
+# ================================ Corpus ================================
+
+class Item:
+    def __init__(self, path: str, golden: Optional[List[Dict[str, str]]]):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(path, "r", encoding="utf-8") as f:
+            self.pages = f.read().split("\f")
+        self.golden = golden
+        self.boxes = [b for p in self.pages for b in reader._find_boxes_in_text(p)]
+        self.blocks = [b for p in self.pages for b in reader._split_entries_by_labels(p)]
+        self.chars = sum(len(p) for p in self.pages)
+
+
+def _golden_for(txt_path: str) -> Optional[List[Dict[str, str]]]:
+    """<name>.<variant>.json if the variant has its own golden, else the shared <name>.json."""
+    stem = os.path.basename(txt_path)[:-len(".txt")]
+    for name in (stem, stem.split(".")[0]):
+        gpath = os.path.join(os.path.dirname(txt_path), name + ".json")
+        if os.path.isfile(gpath):
+            with open(gpath, "r", encoding="utf-8") as f:
+                return json.load(f)
+    return None
+
+
+def load_corpus(extra: List[str]) -> List[Item]:
+    paths = sorted(glob.glob(os.path.join(CORPUS_DIR, "*.txt")))
+    for e in extra:
+        paths += sorted(glob.glob(os.path.join(e, "*.txt"))) if os.path.isdir(e) else [e]
+    return [Item(p, _golden_for(p)) for p in paths]
+
+
+# ================================ Timing ================================
+
+def _timeit(fn: Callable[[], Any], min_time: float) -> Tuple[float, int]:
+    """Seconds per call, auto-repeating until `min_time` has elapsed."""
+    n, total = 0, 0.0
+    while total < min_time:
+        t0 = time.perf_counter()
+        fn()
+        total += time.perf_counter() - t0
+        n += 1
+    return total / n, n
+
+
+def _peak_kib(fn: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def stages(items: List[Item]) -> Dict[str, Tuple[Callable[[], Any], int, int]]:
+    """stage -> (run over whole corpus, boxes handled per run, input chars per run)."""
+    pages = [p for it in items for p in it.pages]
+    boxes = [b for it in items for b in it.boxes]
+    blocks = [b for it in items for b in it.blocks]
+    units = boxes or blocks
+    page_chars = sum(len(p) for p in pages)
+    unit_chars = sum(len(b) for b in units)
+    return {
+        "_text_quality": (lambda: [reader._text_quality(p) for p in pages], len(boxes), page_chars),
+        "_find_boxes_in_text": (lambda: [reader._find_boxes_in_text(p) for p in pages], len(boxes), page_chars),
+        "_split_entries_by_labels": (lambda: [reader._split_entries_by_labels(p) for p in pages], len(blocks), page_chars),
+        "_slice_fields_by_positions": (lambda: [reader._slice_fields_by_positions(b) for b in units], len(units), unit_chars),
+        "_upgrade_from_global_patterns": (
+            lambda: [reader._upgrade_from_global_patterns(b, reader._slice_fields_by_positions(b)) for b in units],
+            len(units), unit_chars),
+        "_parse_entry": (lambda: [reader._parse_entry(b) for b in units], len(units), unit_chars),
+        "page (text path)": (lambda: [reader._parse_page_entries(p) for p in pages], len(units), page_chars),
+    }
+
+
+# =============================== Accuracy ===============================
+
+def _norm(s: str) -> str:
+    return " ".join((s or "").split())
+
+
+def accuracy(item: Item) -> Tuple[int, int, List[str]]:
+    """(matching fields, compared fields, mismatch notes) for one golden item."""
+    got = [e for p in item.pages for e in reader._parse_page_entries(p)]
+    want = item.golden or []
+    ok, total, notes = 0, 0, []
+    for i in range(max(len(got), len(want))):
+        g = got[i] if i < len(got) else {}
+        w = want[i] if i < len(want) else {}
+        for field in FIELDS:
+            total += 1
+            if _norm(g.get(field, "")) == _norm(w.get(field, "")):
+                ok += 1
+            else:
+                notes.append(f"  box {i} {field}: got {_norm(g.get(field, ''))[:70]!r} want {_norm(w.get(field, ''))[:70]!r}")
+    return ok, total, notes
+
+
+# ================================= Main =================================
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--extra", action="append", default=[], help="more page texts (file or directory)")
+    ap.add_argument("--min-time", type=float, default=0.3, help="seconds per stage measurement")
+    ap.add_argument("--fail-under", type=float, default=0.0, help="exit 1 if overall field accuracy is lower")
+    ap.add_argument("-v", "--verbose", action="store_true", help="list field mismatches")
+    args = ap.parse_args()
+
+    items = load_corpus(args.extra)
+    if not items:
+        print("empty corpus")
+        return 1
+    print(f"corpus: {len(items)} texts, {sum(len(i.pages) for i in items)} pages, "
+          f"{sum(i.chars for i in items)} chars, {sum(len(i.boxes) for i in items)} header..footer boxes\n")
+
+    print(f"{'stage':<30} {'calls/s':>10} {'boxes/s':>10} {'chars/s':>12} {'peak KiB':>9}")
+    for name, (fn, n_boxes, n_chars) in stages(items).items():
+        per_run, _ = _timeit(fn, args.min_time)
+        peak = _peak_kib(fn)
+        print(f"{name:<30} {1 / per_run:>10.1f} {n_boxes / per_run:>10.0f} {n_chars / per_run:>12.0f} {peak:>9.1f}")
+
+    print(f"\n{'golden item':<40} {'fields':>8} {'accuracy':>9}")
+    ok_all = total_all = 0
+    for item in items:
+        if item.golden is None:
+            continue
+        ok, total, notes = accuracy(item)
+        ok_all, total_all = ok_all + ok, total_all + total
+        print(f"{item.name:<40} {ok:>3}/{total:<4} {ok / max(1, total):>9.1%}")
+        if args.verbose:
+            print("\n".join(notes))
+    overall = ok_all / max(1, total_all)
+    print(f"{'overall':<40} {ok_all:>3}/{total_all:<4} {overall:>9.1%}")
+    return 1 if overall < args.fail_under else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
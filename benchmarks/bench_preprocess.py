@@ -0,0 +1,116 @@
+"""
+Time the NumPy pre-OCR steps of baugesuch_preprocess on a rendered page.
+
+    python -m benchmarks.bench_preprocess [input/limmatwelle-22-mai.pdf] [--page 12] [--skew 1.2]
+
+The page is rendered in gray at the render profile's automatic scale. Reports ms, Mpx/s and
+peak traced memory per step and for each profile's pipeline, the ink share before/after and
+the share of text ink kept (ink inside the text layer's word boxes, which no step should erase),
+and checks that `estimate_skew` recovers a synthetic --skew applied with the deskew shear.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+import numpy as np
+
+import baugesuch_preprocess as pre
+import baugesuch_reader as reader
+
+
+TEXT_KEPT_MIN = 0.99  # share of text ink every step and profile must keep
+
+
+def render_gray(pdf_path: str, page1: int) -> Tuple[Any, float, Any]:
+    """Gray page image, its scale, and a mask of the text layer's word boxes in pixels."""
+    with reader.PdfSession(pdf_path) as session:
+        w, h = session.page_size(page1)
+        scale = reader._auto_scale(w, h)
+        img = pre.pnm_array(session.render_pnm(page1, scale, grayscale=True))
+        tp = session.page(page1).get_textpage()
+        try:
+            words = reader._text_layer_words(tp, h)
+        finally:
+            tp.close()
+    text = np.zeros(img.shape, bool)
+    for wd in words:
+        text[int(wd["y0"] * scale):int(np.ceil(wd["y1"] * scale)), int(wd["x0"] * scale):int(np.ceil(wd["x1"] * scale))] = True
+    return img, scale, text
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Tuple[float, float, Any]:
+    """Best-of-`repeat` seconds, peak traced MiB of one run, and the result."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return best, peak, out
+
+
+def skewed(img: Any, angle: float) -> Any:
+    """`img` sheared so its lines run at `angle` degrees (the inverse of `deskew`)."""
+    h, w = img.shape
+    shift = np.rint(np.arange(w) * np.tan(np.deg2rad(-angle))).astype(np.int64)
+    shift -= shift[w // 2]
+    out = np.full_like(img, pre.PAPER)
+    for x in range(w):
+        s = int(shift[x])
+        if s >= 0:
+            out[:h - s, x] = img[s:, x]
+        else:
+            out[-s:, x] = img[:h + s, x]
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("pdf", nargs="?", default="input/limmatwelle-22-mai.pdf")
+    ap.add_argument("--page", type=int, default=12)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--skew", type=float, default=1.2)
+    args = ap.parse_args()
+
+    img, scale, words = render_gray(args.pdf, args.page)
+    mpx = img.size / 1e6
+    thresh = pre.otsu_threshold(img)
+    text_ink = (img <= thresh) & words
+    print(f"page {args.page}: {img.shape[1]}x{img.shape[0]} gray at scale {scale}, {mpx:.1f} Mpx, "
+          f"ink {(img <= thresh).mean():.1%}, text ink {text_ink.sum()} px\n")
+    print(f"{'step':<46} {'ms':>8} {'Mpx/s':>8} {'peak MiB':>9} {'ink':>7} {'text kept':>10}")
+    lost: List[str] = []
+
+    def row(name: str, spec: str) -> None:
+        secs, peak, out = measure(lambda: pre.run(img, spec, scale), args.repeat)
+        ink = out <= thresh
+        # text ink is what the binarizer of `spec` (or Otsu) marks as ink inside word boxes
+        binarizer = ",".join(n for n in pre.parse_steps(spec) if n in pre.BINARIZERS)
+        ref = (pre.run(img, binarizer, scale) <= thresh) & words if binarizer else text_ink
+        kept = (ink & ref).sum() / max(1, ref.sum())
+        print(f"{name:<46} {secs * 1e3:>8.1f} {mpx / secs:>8.1f} {peak:>9.1f} {ink.mean():>7.1%} {kept:>10.2%}")
+        if kept < TEXT_KEPT_MIN:
+            lost.append(name)
+
+    for name in pre.STEPS:
+        row(name, name)
+    for prof in reader.RENDER_PROFILES.values():
+        if prof.grayscale and prof.preprocess:
+            row(f"profile {prof.name}: {prof.preprocess}", prof.preprocess)
+
+    tilted = skewed(img, args.skew)
+    found = pre.estimate_skew(tilted)
+    after = pre.estimate_skew(pre.deskew(tilted)[0])
+    print(f"\nskew: applied {args.skew:+.2f}°, estimated {found:+.2f}°, after deskew {after:+.2f}°")
+    assert abs(found - args.skew) <= 2 * pre.SKEW_STEP_DEG, "skew estimate off"
+    assert not lost, f"text ink erased by: {', '.join(lost)}"
+
+
+if __name__ == "__main__":
+    main()
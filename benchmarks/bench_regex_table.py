@@ -0,0 +1,74 @@
+"""
+Micro-benchmark: precompiled pattern table vs. inline `re.search(pattern, ...)` calls.
+
+    python -m benchmarks.bench_regex_table [--boxes 5000] [--repeat 5]
+
+Boxes are taken from benchmarks/corpus and repeated up to --boxes. Compares
+  * the label count of `_split_entries_by_labels`: one `re.search(rf"\\b{lab}\\b")` per label
+    vs. the single multi-label scan `_count_labels`;
+  * every per-entry pattern of the table: `re.search(p.pattern, text, p.flags)` (goes through
+    the `re` module cache) vs. the compiled `p.search(text)`.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from typing import Callable, List, Tuple
+
+import baugesuch_reader as reader
+from benchmarks.bench_parser import load_corpus
+
+TABLE = ["RE_PARZELLE_WORD", "RE_PARZELLE_START", "RE_RESCUE_BH", "RE_RESCUE_BV",
+         "RE_RESCUE_BV_LOOSE", "RE_RESCUE_LAGE", "RE_LANDSCHAFTSZONE", "RE_DEPARTEMENT_BVU"]
+
+
+def _best_pair(old: Callable[[], object], new: Callable[[], object], repeat: int) -> Tuple[float, float]:
+    """Best-of-`repeat` for both, interleaved so drift (turbo, GC) hits both sides alike."""
+    best = [float("inf"), float("inf")]
+    for _ in range(repeat):
+        for i, fn in enumerate((old, new)):
+            t0 = time.perf_counter()
+            fn()
+            best[i] = min(best[i], time.perf_counter() - t0)
+    return best[0], best[1]
+
+
+def _legacy_count(block: str) -> int:
+    return sum(1 for lab in reader.LABELS if re.search(rf"\b{lab}\b", block))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--boxes", type=int, default=5000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    seed: List[str] = [b for it in load_corpus([]) for b in (it.boxes + it.blocks)]
+    boxes = (seed * (args.boxes // max(1, len(seed)) + 1))[:args.boxes]
+    assert all(_legacy_count(b) == reader._count_labels(b) for b in seed), "label count mismatch"
+
+    print(f"{len(boxes)} boxes, best of {args.repeat}\n")
+    print(f"{'case':<22} {'inline ms':>10} {'table ms':>10} {'speedup':>8}")
+
+    def row(name: str, old: Callable[[], object], new: Callable[[], object]) -> None:
+        t_old, t_new = _best_pair(old, new, args.repeat)
+        print(f"{name:<22} {t_old * 1e3:>10.2f} {t_new * 1e3:>10.2f} {t_old / t_new:>7.2f}x")
+
+    row("label count",
+        lambda: [_legacy_count(b) for b in boxes],
+        lambda: [reader._count_labels(b, 3) for b in boxes])
+    for name in TABLE:
+        p = getattr(reader, name)
+        row(name.lower()[3:],
+            lambda p=p: [re.search(p.pattern, b, p.flags) for b in boxes],
+            lambda p=p: [p.search(b) for b in boxes])
+
+    t0 = time.perf_counter()
+    for b in boxes:
+        reader._parse_entry(b)
+    print(f"\n_parse_entry end to end: {len(boxes) / (time.perf_counter() - t0):.0f} boxes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Time layout segmentation (baugesuch_preprocess.segment_blocks) and check it against the text layer.
+
+    python -m benchmarks.bench_segmentation [input/limmatwelle-22-mai.pdf] [--pages 1-20]
+
+Per page: ms, blocks found, and for every Baugesuch box located in the text layer whether one
+block holds it whole and holds no other box. Side-by-side boxes sharing a block would be read
+line by line across both by Tesseract; a box split over blocks is fine as long as it is in one
+column. The run fails if any box shares its block with another.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List, Sequence
+
+import baugesuch_reader as reader
+
+Region = reader.Region
+
+
+def _overlap(a: Region, b: Region) -> float:
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    return max(0.0, w) * max(0.0, h) / max(1e-9, (a[2] - a[0]) * (a[3] - a[1]))
+
+
+def check_boxes(boxes: Sequence[Region], blocks: Sequence[Region]) -> List[str]:
+    """'whole' (90% of it in one block; the box frame itself is not text), 'split' or 'shared' per box."""
+    out = []
+    for box in boxes:
+        holders = [b for b in blocks if _overlap(box, b) > 0.05]
+        shared = any(_overlap(other, b) > 0.5 for b in holders for other in boxes if other is not box)
+        out.append("shared" if shared else "whole" if any(_overlap(box, b) >= 0.9 for b in holders) else "split")
+    return out
+
+
+def parse_pages(spec: str) -> List[int]:
+    pages: List[int] = []
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        lo, _, hi = part.partition("-")
+        pages.extend(range(int(lo), int(hi or lo) + 1))
+    return pages
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("pdf", nargs="?", default="input/limmatwelle-22-mai.pdf")
+    ap.add_argument("--pages", default="", help="e.g. 1-20 or 5,12 (default: all)")
+    args = ap.parse_args()
+
+    with reader.PdfSession(args.pdf) as session:
+        pages = parse_pages(args.pages) or list(range(1, session.page_count() + 1))
+        print(f"{'page':>4} {'ms':>8} {'blocks':>7}  boxes")
+        total, shared = 0.0, 0
+        for page1 in pages:
+            t0 = time.perf_counter()
+            blocks = reader._segment_page(session, page1)
+            secs = time.perf_counter() - t0
+            total += secs
+            boxes = [b["bbox"] for b in reader._extract_layout_boxes(session, page1)]
+            verdicts = check_boxes(boxes, blocks)
+            shared += verdicts.count("shared")
+            print(f"{page1:>4} {secs * 1e3:>8.1f} {len(blocks):>7}  {' '.join(verdicts) or '-'}")
+    print(f"\n{len(pages)} pages, {total / max(1, len(pages)) * 1e3:.1f} ms/page")
+    assert shared == 0, f"{shared} Baugesuch box(es) share an OCR block with another box"
+
+
+if __name__ == "__main__":
+    main()
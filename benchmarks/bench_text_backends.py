@@ -0,0 +1,58 @@
+"""
+Compare the text-layer backends of baugesuch_reader on one issue.
+
+    python -m benchmarks.bench_text_backends [input/limmatwelle-22-mai.pdf] [--repeat 3]
+
+Backends are called directly (no TEXT_CACHE), each with a fresh PdfSession, so the
+numbers include opening the document. Reports the first-page latency and the cost of
+extracting every page; unavailable backends are listed as skipped.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Dict, List
+
+import baugesuch_reader as reader
+
+
+def bench_backend(name: str, pdf_path: str, repeat: int) -> Dict[str, float]:
+    fn = reader.resolve_backend("text", name).fn
+    first: List[float] = []
+    full: List[float] = []
+    chars = 0
+    for _ in range(repeat):
+        with reader.PdfSession(pdf_path) as session:
+            n_pages = session.page_count()
+            t0 = time.perf_counter()
+            got = dict(fn(session, 1))
+            first.append(time.perf_counter() - t0)
+            for page1 in range(2, n_pages + 1):
+                if page1 not in got:  # whole-document backends already returned every page
+                    got.update(fn(session, page1))
+            full.append(time.perf_counter() - t0)
+            chars = sum(len(t) for t in got.values())
+    return {"pages": n_pages, "first_ms": min(first) * 1e3, "all_ms": min(full) * 1e3,
+            "per_page_ms": min(full) * 1e3 / max(1, n_pages), "chars": chars}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("pdf", nargs="?", default="input/limmatwelle-22-mai.pdf")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--backends", default=",".join(reader.backend_names("text")))
+    args = ap.parse_args()
+
+    print(f"{'backend':<8} {'pages':>5} {'first ms':>10} {'all ms':>10} {'ms/page':>9} {'chars':>8}")
+    for name in [n.strip() for n in args.backends.split(",") if n.strip()]:
+        try:
+            r = bench_backend(name, args.pdf, args.repeat)
+        except Exception as e:  # missing optional dependency, broken backend, ...
+            print(f"{name:<8} skipped: {type(e).__name__}: {e}")
+            continue
+        print(f"{name:<8} {r['pages']:>5} {r['first_ms']:>10.1f} {r['all_ms']:>10.1f} "
+              f"{r['per_page_ms']:>9.2f} {r['chars']:>8}")
+
+
+if __name__ == "__main__":
+    main()